@@ -23,6 +23,17 @@ Options:
 		write conll/mention/cluster/link info to files
 		prefix.{mentions,clusters,links,quotes}.tsv (tabular format)
 		prefix.conll (--fmt), and prefix.icarus (ICARUS allocation format)
+	--model=<sonar|riddlecoref>
+		use the pleonastic classifier trained on this corpus (default: sonar);
+		see MODELS
+	--mmap          memory-map the compiled pleonastic classifier, so that
+		concurrent processes share a single copy of it
+	--cache=<file>  store pleonastic classifier verdicts in file and reuse them
+		in later runs for recurring contexts
+	--cascade       "het" matched by one of the original DutchCoref rules for
+		pleonastic pronouns is not passed to the pleonastic classifier
+	--threshold=<p> "het" is pleonastic if the classifier gives it a
+		probability of at least p (default: most probable class)
 	--exclude=<item1,item2,...>
 		exclude given types of mentions/links from output:
 			:singletons: mentions without any coreference links
@@ -44,26 +55,35 @@ import colorama
 import functools
 import getopt
 import io
+import numpy as np
 import os
-import pandas as pd
 import re
 import subprocess
 import sys
 import tempfile
 
 
-from bisect import bisect
+from bisect import bisect, bisect_left
 from collections import defaultdict
 from datetime import datetime
 from glob import glob
 from html import escape
 from itertools import islice
 from jinja2 import Template
-from joblib import load
 from lxml import etree
+from pleonastic.cache import PredictionCache
 from pleonastic.feature_dict import *
+from pleonastic.model import PleonasticModel
 
 
+# Pleonastic pronoun classifiers: the RandomForestClassifier and fitted
+# pipeline trained on each corpus. The RiddleCoref model is in other/pleonastic.
+MODELS = {
+		'sonar': ('pleonastic/data.joblib', 'pleonastic/pipeline.joblib'),
+		'riddlecoref': ('pleonastic/data_riddle.joblib',
+			'pleonastic/pipeline_riddle.joblib'),
+		}
+
 STOPWORDS = (
 		# List of Dutch Stop words (http://www.ranks.nl/stopwords/dutch)
 		'aan af al als bij dan dat de die dit een en er had heb hem het hij '
@@ -108,10 +128,14 @@ class Mention:
 	:ivar clusterid: cluster (entity) ID this mention is in.
 	:ivar prohibit: do not link this mention to these mention IDs.
 	:ivar filter: if True, do not include this mention in output.
-	:ivar relaxedtokens: list of tokens without postnominal modifiers.
+	:ivar relaxedtokens: list of tokens without postnominal modifiers;
+		computed on first use.
 	:ivar head: node corresponding to head word.
+	:ivar headidx: index in sentence of head word.
+	:ivar sent: compiled Sentence of the tree of this mention.
 	:ivar type: one of ('name', 'noun', 'pronoun')
-	:ivar mainmod: list of string tokens that modify the head noun
+	:ivar mainmod: list of string tokens that modify the head noun;
+		computed on first use.
 	:ivar features: dict with following keys and possible values:
 		:number: ('sg', 'pl', both, None); None means unknown.
 		:gender: ('m', 'f', 'n', 'fm', 'nm', 'fn', None)
@@ -120,6 +144,12 @@ class Mention:
 	:ivar antecedent: mention ID of antecedent of this mention, or None.
 	:ivar sieve: name of sieve responsible for linking this mention, or None.
 	"""
+	# no __dict__; a book can have hundreds of thousands of mentions
+	__slots__ = ('id', 'sentno', 'node', 'begin', 'end', 'tokens',
+			'clusterid', 'prohibit', 'filter', 'antecedent', 'sieve',
+			'headidx', 'sent', 'head', 'type', 'features',
+			'_relaxedtokens', '_mainmod')
+
 	def __init__(self, mentionid, sentno, tree, node, begin, end, headidx,
 			tokens, ngdata, gadata):
 		"""Create a new mention.
@@ -146,20 +176,10 @@ class Mention:
 		self.prohibit = set()
 		self.filter = False
 		self.antecedent = self.sieve = None
-		removeids = {n for rng in
-				(range(int(child.get('begin')), int(child.get('end')))
-				for child in node.findall('.//node[@rel="app"]')
-						+ node.findall('.//node[@rel="mod"]'))
-					for n in rng if n > headidx}
-		# without mod/app constituents after head
-		self.relaxedtokens = [token.get('word') for token
-				in sorted((token for token in tree.findall('.//node[@word]')
-					if begin <= int(token.get('begin')) < end
-					and int(token.get('begin')) not in removeids),
-				key=lambda x: int(x.get('begin')))]
-		if not self.relaxedtokens:
-			self.relaxedtokens = self.tokens
-		self.head = (node.find('.//node[@begin="%d"][@word]' % headidx)
+		self.headidx = headidx
+		self.sent = getsentence(tree)
+		self._relaxedtokens = self._mainmod = None
+		self.head = (self.sent.find(node, headidx, isword=True)
 				if len(node) else node)
 		if node.get('pdtype') == 'pron' or node.get('vwtype') == 'bez':
 			self.type = 'pronoun'
@@ -168,20 +188,66 @@ class Mention:
 			self.type = 'name'
 		else:
 			self.type = 'noun'
-		self.mainmod = [a.get('word') for a
-				in (node.findall('.//node[@word]') if len(node) else (node, ))
-				if a.get('rel') == 'mod' or a.get('pt') in ('adj', 'n')
-				and begin <= int(a.get('begin')) < end]
 		self.features = {
 				'human': None, 'gender': None,
 				'number': None, 'person': None}
 		self._detectfeatures(ngdata, gadata)
 
+	@property
+	def relaxedtokens(self):
+		"""Tokens of the span, without the app and mod constituents under
+		node that follow the head; the span itself if nothing is left."""
+		if self._relaxedtokens is None:
+			# without mod/app constituents after head
+			start = self.headidx + 1
+			removed = sorted((max(a, start), b) for a, b
+					in self.sent.spans(self.node, 'rel', ('app', 'mod'))
+					if b > start)
+			span = self.sent.spanrange(self.begin, self.end)
+			self._relaxedtokens = []
+			k = 0
+			for word, n in zip(self.sent.words[span],
+					self.sent.tokenbegins[span]):
+				while k < len(removed) and removed[k][1] <= n:
+					k += 1
+				if k == len(removed) or n < removed[k][0]:
+					self._relaxedtokens.append(word)
+			if not self._relaxedtokens:
+				self._relaxedtokens = self.tokens
+		return self._relaxedtokens
+
+	@property
+	def mainmod(self):
+		"""Words under node that are modifiers, or adjectives and nouns in
+		the span, in document order."""
+		if self._mainmod is None:
+			node, sent = self.node, self.sent
+			if len(node) == 0:
+				self._mainmod = [node.get('word')] if (
+						node.get('rel') == 'mod'
+						or node.get('pt') in ('adj', 'n')
+						and self.begin <= int(node.get('begin')) < self.end
+						) else []
+			else:
+				# word nodes under node, in document order
+				lo, hi = sent.descendants(node)
+				begin = sent.begin[lo:hi]
+				mask = (sent.column('word')[lo:hi] != 0) & (
+						(sent.column('rel')[lo:hi] == sent.code('mod'))
+						| (np.isin(sent.column('pt')[lo:hi],
+							[sent.code('adj'), sent.code('n')])
+							& (self.begin <= begin) & (begin < self.end)))
+				self._mainmod = [sent.nodes[n].get('word')
+						for n in (lo + np.flatnonzero(mask)).tolist()]
+		return self._mainmod
+
 	def _detectfeatures(self, ngdata, gadata):
 		"""Set features for this mention based on linguistic features or
 		external dataset."""
-		self.features['number'] = self.head.get(
-				'rnum', self.head.get('num'))
+		number = self.head.get('rnum', self.head.get('num'))
+		# share one string object per value among all mentions
+		self.features['number'] = (
+				None if number is None else sys.intern(number))
 		if self.features['number'] is None and 'getal' in self.head.keys():
 			self.features['number'] = {
 					'ev': 'sg', 'mv': 'pl', 'getal': 'both'
@@ -265,6 +331,9 @@ class Quotation:
 	:ivar addressee: detected addressee Mention object.
 	:ivar mentions: list of Mention objects occurring in this quote.
 	"""
+	__slots__ = ('start', 'end', 'sentno', 'parno', 'sentbounds', 'speaker',
+			'addressee', 'mentions', 'text')
+
 	def __init__(self, start, end, sentno, parno, text, sentbounds):
 		"""
 		:param start: global token start index.
@@ -284,67 +353,99 @@ class Quotation:
 		self.text = text
 
 
-def getmentions(clf, pipeline, trees, ngdata, gadata):
+def getmentions(model, trees, ngdata, gadata):
 	"""Collect mentions."""
 	debug(color('mention detection', 'yellow'))
 	mentions = []
+	candidates = [getcandidates(tree) for _, tree in trees]
+	# classify all "het" candidates of the document in a single batch
+	hetnodes = {node: tree for (_, tree), nodes in zip(trees, candidates)
+			for node in nodes if node.get('lemma') == 'het'}
+	pleonastic = model.classify(list(hetnodes.items()))
+	debug('pleonastic classifier: %s' % model.report())
 	for sentno, (_, tree) in enumerate(trees):
-		candidates = []
-		candidates.extend(tree.xpath('.//node[@cat="np"]'))
-		# candidates.extend(tree.xpath(
-		# 		'.//node[@cat="conj"]/node[@cat="np" or @pt="n"]/..'))
-		candidates.extend(tree.xpath(
-				'.//node[@cat="mwu"]/node[@pt="spec"]/..'))
-		candidates.extend(tree.xpath('.//node[@pt="n"]'
-				'[@ntype="eigen" or @rel="su" or @rel="obj1" or @rel="body"]'))
-		candidates.extend(tree.xpath(
-				'.//node[@pdtype="pron" or @vwtype="bez"]'))
-		candidates.extend(tree.xpath(
-				'.//node[@pt="num" and @rel!="det" and @rel!="mod"]'))
-		candidates.extend(tree.xpath('.//node[@pt="det" and @rel!="det"]'))
 		covered = set()
-		for candidate in candidates:
-			considermention(clf, pipeline, candidate, tree, sentno, mentions, covered,
-					ngdata, gadata)
+		for candidate in candidates[sentno]:
+			considermention(model, candidate, tree, sentno, mentions,
+					covered, ngdata, gadata, pleonastic)
 	return mentions
 
 
-def considermention(clf, pipeline, node, tree, sentno, mentions, covered, ngdata, gadata):
-	"""Decide whether a candidate mention should be added."""
+def getcandidates(tree):
+	"""Return list of candidate mention nodes in tree, in order of priority.
+
+	All nodes are matched against the rules at once, using the compiled
+	Sentence. A node is returned only for the first rule that it matches;
+	considering it again for a later rule would not add a mention, since
+	its head is then either covered or rejected for the same reasons."""
+	sent = getsentence(tree)
+	cat, pt, rel = sent.column('cat'), sent.column('pt'), sent.column('rel')
+	code = sent.code
+
+	def isrel(*values):
+		return np.isin(rel, [sent.code(value) for value in values])
+
+	# nodes with a child that is a special token (pt="spec")
+	hasspec = np.zeros(len(sent.nodes), dtype=bool)
+	hasspec[sent.parent[(pt == code('spec')) & (sent.parent != -1)]] = True
+	rules = [
+			# './/node[@cat="np"]'
+			cat == code('np'),
+			# './/node[@cat="conj"]/node[@cat="np" or @pt="n"]/..'
+			# './/node[@cat="mwu"]/node[@pt="spec"]/..'
+			(cat == code('mwu')) & hasspec,
+			# './/node[@pt="n"]'
+			# '[@ntype="eigen" or @rel="su" or @rel="obj1" or @rel="body"]'
+			(pt == code('n')) & ((sent.column('ntype') == code('eigen'))
+				| isrel('su', 'obj1', 'body')),
+			# './/node[@pdtype="pron" or @vwtype="bez"]'
+			(sent.column('pdtype') == code('pron'))
+				| (sent.column('vwtype') == code('bez')),
+			# './/node[@pt="num" and @rel!="det" and @rel!="mod"]'
+			(pt == code('num')) & (rel != 0) & ~isrel('det', 'mod'),
+			# './/node[@pt="det" and @rel!="det"]'
+			(pt == code('det')) & (rel != 0) & ~isrel('det'),
+			]
+	# the first rule that each node matches
+	first = np.full(len(sent.nodes), len(rules))
+	for n, rule in reversed(list(enumerate(rules))):
+		first[rule] = n
+	matched = np.flatnonzero(first < len(rules))
+	return [sent.nodes[n]
+			for n in matched[np.argsort(first[matched], kind='stable')]]
+
+
+def considermention(model, node, tree, sentno, mentions, covered,
+		ngdata, gadata, pleonastic=None):
+	"""Decide whether a candidate mention should be added.
+
+	:param pleonastic: dict with precomputed pleonastic verdicts for "het"
+		nodes, as returned by PleonasticModel.classify()."""
 	if len(node) == 0 and 'word' not in node.keys():
 		return
+	sent = getsentence(tree)
 	headidx = getheadidx(node)
-	indices = sorted(int(token.get('begin')) for token
-			in (node.findall('.//node[@word]') if len(node) else [node]))
+	words = sent.wordbegins(node)
+	indices = words if len(node) else [int(node.get('begin'))]
 	a, b = min(indices), max(indices) + 1
 	# allow comma when preceded by conjunct, adjective, or location.
-	for punct in tree.getroot().findall('./node/node[@pt="let"]'):
-		i = int(punct.get('begin'))
-		if (a <= i < b
-			and (node.find('.//node[@begin="%d"][@rel="cnj"]' % (i - 1))
-					is not None
-				or node.find('.//node[@begin="%d"][@pt="adj"]' % (i - 1))
-					is not None
-				or node.find('.//node[@begin="%d"][@neclass="LOC"]' % (i - 1))
-					is not None)):
-			indices.append(i)
+	puncts = [i for i in sent.puncts if a <= i < b]
+	if puncts:
+		allowed = sent.commabegins(node)
+		indices = indices + [i for i in puncts if i - 1 in allowed]
 	indices.sort()
 	# if span is interrupted by a discontinuity from other words or
 	# punctuation, cut off mention before it; avoids weird long mentions.
 	if indices != list(range(a, b)):
 		b = min(n for n in range(a, b) if n not in indices)
 		if headidx > b:
-			headidx = max(int(a.get('begin')) for a
-					in node.findall('.//node[@word]')
-					if int(a.get('begin')) < b)
+			headidx = max([n for n in words if n < b])
 	# Relative clauses: [de man] [die] ik eerder had gezien.
 	relpronoun = node.find('./node[@cat="rel"]/node[@wh="rel"]')
 	if relpronoun is not None and int(relpronoun.get('begin')) < b:
 		b = int(relpronoun.get('begin'))
 		if headidx > b:
-			headidx = max(int(a.get('begin')) for a
-					in node.findall('.//node[@word]')
-					if int(a.get('begin')) < b)
+			headidx = max([n for n in words if n < b])
 	# Appositives: "[Jan], [de schilder]"
 	# but: "[acteur John Cleese]"
 	if (len(node) > 1 and node[1].get('rel') == 'app'
@@ -360,31 +461,30 @@ def considermention(clf, pipeline, node, tree, sentno, mentions, covered, ngdata
 	if tokens[-1] in ',\'"()':
 		tokens = tokens[:-1]
 		b -= 1
-	head = (node.find('.//node[@begin="%d"]' % headidx)
-			if len(node) else node)
+	head = sent.find(node, headidx) if len(node) else node
 	# various
 	if head.get('lemma') in ('aantal', 'keer', 'toekomst', 'manier'):
 		return
-	if pleonasticpronoun(clf, pipeline, node, tree):
+	if pleonasticpronoun(model, node, tree, pleonastic):
 		return
 	if (headidx not in covered
 			# discard measure phrases
 			# and node.find('.//node[@num="meas"]') is None
 			and node.get('num') != "meas"
-			and node.find('./node[@pt="tw"]') is None
+			and sent.find(node, children=True, pt='tw') is None
 			# and not tokens[0].isnumeric()
 			# "a few" ...
 			and (node.get('cat') != 'np' or node.get('rel') != 'det')
 			# "welk" in "Ik ga niet zeggen welk restaurant"
-			and node.find('.//node[@begin="%d"][@vwtype="onbep"]' % a) is None
-			and node.find('.//node[@begin="%d"][@vwtype="vb"]' % a) is None
+			and sent.find(node, a, vwtype='onbep') is None
+			and sent.find(node, a, vwtype='vb') is None
 			# "iets"
 			and node.get('vwtype') not in ('onbep', 'vb')
 			# temporal expressions
 			and head.get('special') != 'tmp' and node.get('special') != 'tmp'
 			# partitive / quantifier
 			# ongeveer 12 dollar
-			and node.find('./node[@sc="noun_prep"]') is None
+			and sent.find(node, children=True, sc='noun_prep') is None
 			# and (node.get('cat') != 'np'
 			# 	or node[0].get('pos') not in ('adj', 'noun'))
 			# het fietsen
@@ -429,26 +529,18 @@ def posAttrib(pos, node):
 	return nxt, prv
 
 
-def pleonasticpronoun(clf, pipeline, node, tree):
+def pleonasticpronoun(model, node, tree, pleonastic=None):
 	"""Return True if node is a pleonastic (non-referential) pronoun.
-	Extracts features from the node and its parsetree and stores it in
-	a pandas DataFrame. Uses scikit-learn's RandomForestClassifier and 
-	a custom PipeLine to classify node as pleonastic [1]."""
-	if node.get("lemma") == "het":
-		f_dict = featureDict(node, tree)
-
-		# create pandas DataFrame
-		df = pd.DataFrame(dict(f_dict), index = [0])
+	Extracts features from the node and its parsetree and vectorizes them
+	with the compiled pipeline. Uses a RandomForestClassifier, evaluated by
+	ForestEngine, to classify node as pleonastic [1].
 
-		# transform DataFrame for pipeline
-		X_prep = pipeline.transform(df)
-		pred = clf.predict(X_prep)			
-
-		# if classifier predicts [1]: pronoun is pleonastic
-		if pred == [1]:
-			return True
-		else:
-			return False
+	:param pleonastic: if given, look up node in this dict of precomputed
+		verdicts before classifying it on its own."""
+	if node.get("lemma") == "het":
+		if pleonastic is not None and node in pleonastic:
+			return pleonastic[node]
+		return model.classify([(node, tree)])[node]
 
 
 def getquotations(trees):
@@ -477,9 +569,7 @@ def getquotations(trees):
 	parnos = []  # map global token index to parno
 	i = 0
 	for sentno, ((parno, psentno), tree) in enumerate(trees):
-		for n, token in enumerate(sorted(
-				tree.iterfind('.//node[@word]'),
-				key=lambda x: int(x.get('begin')))):
+		for n, token in enumerate(getsentence(tree).tokennodes):
 			doc.append(token)
 			parbreak.append(psentno == 1 and n == 0)
 			idx[sentno, n] = i
@@ -1025,10 +1115,10 @@ def resolvepronouns(mentions, clusters, quotations):
 							mentions, clusters)
 
 
-def resolvecoreference(clf, pipeline, trees, ngdata, gadata, mentions=None):
+def resolvecoreference(model, trees, ngdata, gadata, mentions=None):
 	"""Get mentions and apply coreference sieves."""
 	if mentions is None:
-		mentions = getmentions(clf, pipeline, trees, ngdata, gadata)
+		mentions = getmentions(model, trees, ngdata, gadata)
 	clusters = [{n} for n, _ in enumerate(mentions)]
 	quotations, idx, doc = getquotations(trees)
 	if VERBOSE:
@@ -1068,13 +1158,173 @@ def parsesentid(path):
 				'parno-sentno.xml, p.parno.s.sentno.xml. Got: %s' % filename)
 
 
+class Sentence:
+	"""Compiled representation of an Alpino tree.
+
+	Built once per tree, right after it is parsed. Nodes are stored in
+	document order, so that the descendants of a node form a contiguous
+	range, and attribute values as integer codes (see codes); span, head and
+	attribute queries are answered with these arrays and an index of begin
+	positions, instead of evaluating XPath expressions on the tree.
+
+	:ivar nodes: the node elements in document order; the top node is first.
+	:ivar index: dict mapping each node element to its position in nodes.
+	:ivar begin, end: arrays with the span of each node.
+	:ivar parent: array with the position of the parent of each node; -1
+		for the top node.
+	:ivar last: array with the position after the last descendant of each
+		node; the descendants of node n are at positions n + 1 ... last[n] - 1.
+	:ivar bybegin: dict mapping a begin to the positions of the nodes
+		with that begin.
+	:ivar tokens: array with the positions of the word nodes, by begin.
+	:ivar tokennodes: list with the word nodes, by begin; replaces
+		sorted(tree.iterfind('.//node[@word]'), key=begin).
+	:ivar tokenbegins: list with the begin of each word node in tokens.
+	:ivar words: list with the word of each node in tokens.
+	:ivar puncts: begins of the punctuation directly under the top node,
+		in document order.
+	:ivar codes: dict mapping the attribute values of this tree to integer
+		codes; 0 stands for a missing attribute. Kept per tree, so that
+		the values of a document are released together with its trees.
+	"""
+	def __init__(self, tree):
+		self.nodes = list(tree.getroot().iter('node'))
+		self.index = dict(zip(self.nodes, range(len(self.nodes))))
+		parent = [self.index.get(node.getparent(), -1) for node in self.nodes]
+		# number of nodes in the subtree of each node
+		size = [1] * len(self.nodes)
+		for n in range(len(self.nodes) - 1, 0, -1):
+			if parent[n] != -1:
+				size[parent[n]] += size[n]
+		begin = [int(node.get('begin')) for node in self.nodes]
+		self.bybegin = defaultdict(list)
+		for n, a in enumerate(begin):
+			self.bybegin[a].append(n)
+		self.begin = np.array(begin, dtype=np.int32)
+		self.end = np.array([int(node.get('end')) for node in self.nodes],
+				dtype=np.int32)
+		self.parent = np.array(parent, dtype=np.int32)
+		self.last = np.arange(len(self.nodes), dtype=np.int32) + size
+		self.codes = {None: 0}
+		self.columns = {}
+		tokens = sorted(
+				(n for n, code in enumerate(self.column('word')) if code),
+				key=begin.__getitem__)
+		self.tokens = np.array(tokens, dtype=np.int32)
+		self.tokennodes = [self.nodes[n] for n in tokens]
+		self.tokenbegins = [begin[n] for n in tokens]
+		self.words = [node.get('word') for node in self.tokennodes]
+		self.puncts = [int(punct.get('begin')) for punct
+				in tree.getroot().findall('./node/node[@pt="let"]')]
+
+	def code(self, value):
+		"""Return the integer code of an attribute value; -1 if it does not
+		occur in this tree."""
+		return self.codes.get(value, -1)
+
+	def column(self, attrib):
+		"""Return an array with the code of attrib for each node.
+
+		The array for an attribute is built on first use."""
+		column = self.columns.get(attrib)
+		if column is None:
+			codes = self.codes
+			column = self.columns[attrib] = np.array(
+					[codes.setdefault(value, len(codes)) for value
+						in (node.get(attrib) for node in self.nodes)],
+					dtype=np.int32)
+		return column
+
+	def descendants(self, node):
+		"""Return the range of positions of the descendants of node."""
+		n = self.index[node]
+		return n + 1, self.last[n]
+
+	def spanrange(self, begin, end):
+		"""Return the slice of tokens with a begin in range(begin, end)."""
+		return slice(bisect_left(self.tokenbegins, begin),
+				bisect_left(self.tokenbegins, end))
+
+	def span(self, begin, end):
+		"""Return the words with a begin in range(begin, end), in order."""
+		return self.words[self.spanrange(begin, end)]
+
+	def spans(self, node, attrib, values):
+		"""Return (begin, end) of the nodes under node with one of the given
+		values for attrib, in document order."""
+		lo, hi = self.descendants(node)
+		mask = np.isin(self.column(attrib)[lo:hi],
+				[self.code(value) for value in values])
+		return list(zip(self.begin[lo:hi][mask].tolist(),
+				self.end[lo:hi][mask].tolist()))
+
+	def wordbegins(self, node):
+		"""Return the sorted begins of the word nodes under node."""
+		lo, hi = self.descendants(node)
+		return sorted(self.begin[lo:hi][
+				self.column('word')[lo:hi] != 0].tolist())
+
+	def commabegins(self, node):
+		"""Return the set of begins of the conjuncts, adjectives and
+		locations under node; a comma may follow them in a mention."""
+		lo, hi = self.descendants(node)
+		mask = ((self.column('rel')[lo:hi] == self.code('cnj'))
+				| (self.column('pt')[lo:hi] == self.code('adj'))
+				| (self.column('neclass')[lo:hi] == self.code('LOC')))
+		return set(self.begin[lo:hi][mask].tolist())
+
+	def find(self, node, begin=None, isword=False, children=False,
+			**attribs):
+		"""Return the first node under node in document order with the
+		given begin and attribute values, or None.
+
+		Equivalent to node.find('.//node[@begin="..."][@attrib="..."]');
+		with isword=True, only word nodes match; with children=True, only
+		the children of node, as with './node[...]'."""
+		lo, hi = self.descendants(node)
+		if begin is not None:
+			# usually only a few nodes have a given begin
+			candidates = [n for n in self.bybegin.get(begin, ())
+					if lo <= n < hi]
+		elif children:
+			candidates = self.children(lo - 1)
+		else:
+			candidates = range(lo, hi)
+		if children and begin is not None:
+			candidates = [n for n in candidates if self.parent[n] == lo - 1]
+		if isword:
+			word = self.column('word')
+			candidates = [n for n in candidates if word[n]]
+		for attrib, value in attribs.items():
+			column, code = self.column(attrib), self.code(value)
+			candidates = [n for n in candidates if column[n] == code]
+		return self.nodes[candidates[0]] if candidates else None
+
+	def children(self, n):
+		"""Return the positions of the children of node n."""
+		result = []
+		m = n + 1
+		while m < self.last[n]:
+			result.append(m)
+			m = self.last[m]
+		return result
+
+
+@functools.lru_cache(maxsize=4096)
+def getsentence(tree):
+	"""Return the compiled Sentence for tree, building it on first use.
+
+	lxml trees do not accept attributes or weak references, so the sentences
+	are cached here; process() clears the cache for each document. The
+	cache is bounded, since callers of resolvecoreference() such as
+	runtests() do not clear it; the bound is large enough to keep the trees
+	of a document compiled while its sentences are visited again."""
+	return Sentence(tree)
+
+
 def gettokens(tree, begin, end):
 	"""Return tokens of span in tree as list of strings."""
-	return [token.get('word') for token
-			in sorted((token for token
-				in tree.findall('.//node[@word]')
-				if begin <= int(token.get('begin')) < end),
-			key=lambda x: int(x.get('begin')))]
+	return getsentence(tree).span(begin, end)
 
 
 def getheadidx(node):
@@ -1277,9 +1527,7 @@ def nglookup(key, ngdata):
 def writetabular(trees, mentions,
 		docname='-', part=0, file=sys.stdout, fmt=None, startcluster=0):
 	"""Write output in tabular format."""
-	sentences = [sorted(tree.iterfind('.//node[@word]'),
-				key=lambda x: int(x.get('begin')))
-			for _, tree in trees]
+	sentences = [getsentence(tree).tokennodes for _, tree in trees]
 	sentids = ['%d-%d' % (parno, sentno) for (parno, sentno), _ in trees]
 	labels = [[''] * len(sent) for sent in sentences]
 	for mention in sortmentions(mentions):
@@ -1453,10 +1701,7 @@ def icarusallocation(mentions, clusters, docname='-', part=0, file=sys.stdout):
 def htmlvis(trees, mentions, clusters, quotations):
 	"""Visualize coreference in HTML document."""
 	output = []
-	sentences = [[a.get('word') for a
-			in sorted(tree.iterfind('.//node[@word]'),
-				key=lambda x: int(x.get('begin')))]
-			for _, tree in trees]
+	sentences = [list(getsentence(tree).words) for _, tree in trees]
 	sentids = [(parno, sentno) for (parno, sentno), _ in trees]
 	for mention in sortmentions(mentions):
 		if mention.filter:
@@ -1548,8 +1793,7 @@ def getunivdeps(filenames, trees):
 	conll = re.sub(r'<pre><code.*?</sentence>\n|[ \t]+!\n\s+</code></pre>',
 			'', conll.decode('utf8'))
 	for (_, tree), chunk in zip(trees, conll.split('\n\n')):
-		tokens = sorted(tree.iterfind('.//node[@word]'),
-					key=lambda x: int(x.get('begin')))
+		tokens = getsentence(tree).tokennodes
 		chunk = [line.split('\t') for line in chunk.splitlines()]
 		if len(tokens) != len(chunk):
 			raise ValueError('sentence length mismatch.')
@@ -1613,10 +1857,7 @@ def comparementions(conlldata, trees, mentions, goldspans, respspans,
 	mention detection sieve and the 'gold' standard. Green brackets are
 	correct, yellow brackets are mention boundaries only found in the gold
 	standard, and red brackets are only found in our output."""
-	sentences = [[a.get('word') for a in
-			sorted(tree.iterfind('.//node[@word]'),
-				key=lambda x: int(x.get('begin')))]
-			for _, tree in trees]
+	sentences = [list(getsentence(tree).words) for _, tree in trees]
 	print(color('mentions in gold missing from response:', 'yellow'), file=out)
 	for _sentno, _begin, _end, text in goldspans - respspans:
 		print(text, file=out)
@@ -1876,7 +2117,7 @@ def postprocess(exclude, mentions, clusters, goldmentions):
 					mention.filter = True
 
 
-def process(clf, pipeline, path, output, ngdata, gadata,
+def process(model, path, output, ngdata, gadata,
 		docname='-', conllfile=None, fmt=None,
 		start=None, end=None, startcluster=0,
 		goldmentions=False, exclude=(), outputprefix=None):
@@ -1889,13 +2130,16 @@ def process(clf, pipeline, path, output, ngdata, gadata,
 	filenames = sorted(glob(path), key=parsesentid)[start:end]
 	trees = [(parsesentid(filename), etree.parse(filename))
 			for filename in filenames]
+	getsentence.cache_clear()
+	for _, tree in trees:
+		getsentence(tree)
 	if conllfile is not None:
 		conlldata = readconll(conllfile, docname)[start:end]
 	mentions = None
 	if goldmentions:
 		mentions = extractmentionsfromconll(conlldata, trees, ngdata, gadata)
 	mentions, clusters, quotations, idx = resolvecoreference(
-			clf, pipeline, trees, ngdata, gadata, mentions)
+			model, trees, ngdata, gadata, mentions)
 	postprocess(exclude, mentions, clusters, goldmentions)
 	if conllfile is not None and VERBOSE:
 		debug(color('evaluating against:', 'yellow'), conllfile, docname)
@@ -1918,7 +2162,7 @@ def process(clf, pipeline, path, output, ngdata, gadata,
 	return len(clusters)
 
 
-def clindev(ngdata, gadata, goldmentions):
+def clindev(model, ngdata, gadata, goldmentions):
 	"""Run on CLIN26 shared task dev data and evaluate."""
 	timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
 	path = os.path.join('results/clindev/', timestamp)
@@ -1929,7 +2173,7 @@ def clindev(ngdata, gadata, goldmentions):
 				os.path.basename(conllfile).split('_')[0])
 		docname = os.path.basename(conllfile)
 		with open(os.path.join(path, docname), 'w') as out:
-			process(dirname + '/*.xml', out, ngdata, gadata,
+			process(model, dirname + '/*.xml', out, ngdata, gadata,
 					docname=docname, conllfile=conllfile,
 					goldmentions=goldmentions, start=0, end=6)
 			# shared task says the first 7 sentences are annotated,
@@ -1946,7 +2190,7 @@ def clindev(ngdata, gadata, goldmentions):
 		print(inp.read())
 
 
-def semeval(ngdata, gadata, goldmentions):
+def semeval(model, ngdata, gadata, goldmentions):
 	"""Run on semeval 2010 shared task dev data and evaluate."""
 	timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
 	path = os.path.join('results/semevaldev/', timestamp)
@@ -1956,7 +2200,7 @@ def semeval(ngdata, gadata, goldmentions):
 		for dirname in sorted(glob('data/semeval2010NLdevparses/*/'),
 				key=lambda x: int(x.rstrip('/').split('_')[1])):
 			docname = os.path.basename(dirname.rstrip('/'))
-			startcluster += process(dirname, out, ngdata, gadata,
+			startcluster += process(model, dirname, out, ngdata, gadata,
 					fmt='semeval2010', docname=docname,
 					conllfile='data/semeval2010/task01.posttask.v1.0/'
 						'corpora/training/nl.devel.txt.fixed',
@@ -1975,14 +2219,14 @@ def semeval(ngdata, gadata, goldmentions):
 		print(inp.read())
 
 
-def runtests(ngdata, gadata):
+def runtests(model, ngdata, gadata):
 	"""Some simple tests."""
 	print('ref (each sentence should have a coreference link)')
 	trees = [(parsesentid(filename), etree.parse(filename))
 			for filename in sorted(glob('tests/ref/*.xml'), key=parsesentid)]
 	for n, _ in enumerate(trees):
 		mentions, clusters, _quotations, _idx = resolvecoreference(
-				clf, pipeline, trees[n:n + 1], ngdata, gadata)
+				model, trees[n:n + 1], ngdata, gadata)
 		print('%d. %s' % (n, ' '.join(gettokens(trees[n][1], 0, 999))))
 		for m, mention in enumerate(mentions):
 			print(m, mention)
@@ -1995,7 +2239,7 @@ def runtests(ngdata, gadata):
 			for filename in sorted(glob('tests/nonref/*.xml'), key=parsesentid)]
 	for n, _ in enumerate(trees):
 		mentions, clusters, _quotations, _idx = resolvecoreference(
-				clf, pipeline, trees[n:n + 1], ngdata, gadata)
+				model, trees[n:n + 1], ngdata, gadata)
 		print('%d. %s' % (n, ' '.join(gettokens(trees[n][1], 0, 999))))
 		for m, mention in enumerate(mentions):
 			print(m, mention)
@@ -2009,7 +2253,7 @@ def runtests(ngdata, gadata):
 				key=parsesentid)]
 	for n, _ in enumerate(trees):
 		mentions, clusters, _quotations, _idx = resolvecoreference(
-				clf, pipeline, trees[n:n + 1], ngdata, gadata)
+				model, trees[n:n + 1], ngdata, gadata)
 		print('%d. %s [%d mentions]' % (
 				n, ' '.join(gettokens(trees[n][1], 0, 999)), len(mentions)))
 		for m, mention in enumerate(mentions):
@@ -2022,30 +2266,37 @@ def runtests(ngdata, gadata):
 
 def main():
 	"""CLI"""
-	longopts = ['fmt=', 'slice=', 'gold=', 'exclude=', 'outputprefix=',
-			'help', 'verbose', 'test', 'clindev', 'semeval', 'goldmentions']
+	longopts = ['fmt=', 'slice=', 'gold=', 'exclude=', 'outputprefix=', 'cache=',
+			'help', 'verbose', 'test', 'clindev', 'semeval', 'goldmentions',
+			'mmap', 'cascade', 'threshold=', 'model=']
 	try:
 		opts, args = getopt.gnu_getopt(sys.argv[1:], '', longopts)
 	except getopt.GetoptError:
 		print(__doc__)
 		return
 	opts = dict(opts)
-	if '--help' in opts:
+	if '--help' in opts or opts.get('--model', 'sonar') not in MODELS:
 		print(__doc__)
 		return
 	if '--verbose' in opts:
 		setverbose(True, sys.stdout)
 		sys.argv.remove('--verbose')
 	ngdata, gadata = readngdata()
-	# load RandomForestClassifier and pipeline
-	clf = load("pleonastic/data.joblib")
-	pipeline = load("pleonastic/pipeline.joblib")
+	# RandomForestClassifier and pipeline are loaded on first use
+	model = PleonasticModel(*MODELS[opts.get('--model', 'sonar')],
+			mmap_mode='r' if '--mmap' in opts else None,
+			cache=PredictionCache(),
+			cascade='--cascade' in opts,
+			threshold=float(opts['--threshold'])
+				if '--threshold' in opts else None)
+	if '--cache' in opts:
+		model.cache.load(opts['--cache'], model.fingerprint())
 	if '--clindev' in opts:
-		clindev(ngdata, gadata, '--goldmentions' in opts)
+		clindev(model, ngdata, gadata, '--goldmentions' in opts)
 	elif '--semeval' in opts:
-		semeval(ngdata, gadata, '--goldmentions' in opts)
+		semeval(model, ngdata, gadata, '--goldmentions' in opts)
 	elif '--test' in opts:
-		runtests(ngdata, gadata)
+		runtests(model, ngdata, gadata)
 	else:
 		start, end = opts.get('--slice', ':').split(':')
 		start = int(start) if start else None
@@ -2057,7 +2308,7 @@ def main():
 		exclude = [a for a in opts.get('--exclude', '').split(',') if a]
 		if '--outputprefix' in opts:
 			with open(opts['--outputprefix'] + '.conll', 'w') as out:
-				process(clf, pipeline, path, out, ngdata, gadata,
+				process(model, path, out, ngdata, gadata,
 						fmt=opts.get('--fmt'), start=start, end=end,
 						docname=os.path.basename(path.rstrip('/')),
 						conllfile=opts.get('--gold'),
@@ -2065,12 +2316,14 @@ def main():
 						outputprefix=opts.get('--outputprefix'),
 						exclude=exclude)
 		else:
-			process(clf, pipeline, path, sys.stdout, ngdata, gadata,
+			process(model, path, sys.stdout, ngdata, gadata,
 					fmt=opts.get('--fmt'), start=start, end=end,
 					docname=os.path.basename(path.rstrip('/')),
 					conllfile=opts.get('--gold'),
 					goldmentions='--goldmentions' in opts,
 					exclude=exclude)
+	if '--cache' in opts:
+		model.cache.save(opts['--cache'], model.fingerprint())
 
 
 if __name__ == '__main__':
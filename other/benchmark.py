@@ -0,0 +1,195 @@
+"""Benchmark the pleonastic pronoun classifier.
+
+Usage: python3 benchmark.py [options]
+
+Like the other scripts in this folder, run it from the DutchCoref
+installation folder that the pleonastic package was copied to (see README).
+
+Times each stage of the classification of "het" separately, and the whole
+on a fixed set of Alpino trees; reports throughput (rows/s), p50 and p99
+latency of a single row, and peak memory of a batch. Before timing, checks
+that classifying the rows in a batch gives the same probabilities as the
+original classification of one row at a time.
+
+Options:
+	--trees=<dir>       directory with Alpino XML files
+		(default: data/benchmark next to this script, small synthetic
+		sentences)
+	--copies=N          parse every tree N times (default: 100)
+	--samples=N         number of rows timed one at a time (default: 200)
+	--model=<file>      forest (default: pleonastic/data.joblib)
+	--pipeline=<file>   fitted pipeline (default: pleonastic/pipeline.joblib)
+	--output=<file>     write results as JSON (default: benchmark.json)
+"""
+import os
+import sys
+import json
+import time
+import getopt
+import platform
+import tracemalloc
+import numpy as np
+import pandas as pd
+import sklearn
+
+from glob import glob
+from joblib import load
+from lxml import etree
+
+from pleonastic.feature_dict import featureDict
+from pleonastic.feature_extractor import treeIndex
+from pleonastic.forest import ForestEngine
+from pleonastic.model import PleonasticModel
+from pleonastic.vectorizer import FeatureVectorizer
+
+
+def measure(batch, single, items, samples):
+	"""Time batch(items) and single(item) for the first samples items.
+
+	:returns: dict with rows/s of the batch, p50 and p99 latency of a single
+		item in milliseconds, and peak memory of the batch in KB."""
+	latencies = []
+	for item in items[:samples]:
+		start = time.perf_counter()
+		single(item)
+		latencies.append(time.perf_counter() - start)
+
+	start = time.perf_counter()
+	batch(items)
+	seconds = time.perf_counter() - start
+
+	# measured in a separate run, since tracing slows down allocations
+	tracemalloc.start()
+	batch(items)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return dict(
+			rows=len(items),
+			rows_per_sec=len(items) / seconds,
+			p50_ms=1000 * np.percentile(latencies, 50),
+			p99_ms=1000 * np.percentile(latencies, 99),
+			peak_kb=peak / 1024)
+
+
+def dataframe(rows):
+	"""Return a DataFrame of feature dicts that the pipeline transforms as
+	it does each row on its own.
+
+	pandas infers a str dtype for a column of strings and turns its None
+	values into NaN, which the encoder knows as a category; in a single row,
+	None stays an unknown category. None is restored in these columns."""
+	df = pd.DataFrame(rows)
+	for column in df.columns:
+		values = df[column]
+		if (not pd.api.types.is_numeric_dtype(values)
+				and values.isna().any()):
+			df[column] = values.astype(object).where(values.notna(), None)
+	return df
+
+
+def checkbatch(clf, pipeline, vectorizer, engine, rows):
+	"""Raise ValueError if classifying rows in a batch, with the pipeline or
+	with the vectorizer and engine, gives other probabilities than the
+	original pd.DataFrame of one row that pleonasticpronoun() classified."""
+	single = np.vstack([clf.predict_proba(pipeline.transform(
+			pd.DataFrame(dict(row), index=[0]))) for row in rows])
+	batches = [
+			("pipeline", clf.predict_proba(pipeline.transform(
+				dataframe(rows)))),
+			("engine", engine.predict_proba(vectorizer.transform(rows))),
+			]
+	for name, batch in batches:
+		if not np.allclose(batch, single, rtol=0, atol=1e-9):
+			raise ValueError("%s: batch probabilities differ from a single "
+					"row for %d of %d rows" % (name, np.sum(np.any(
+						~np.isclose(batch, single, rtol=0, atol=1e-9),
+						axis=1)), len(rows)))
+	print("batch and single row probabilities agree for %d rows" % len(rows))
+
+
+def benchmark(trees, clfpath, pipelinepath, samples):
+	"""Run all stages on the "het" nodes of trees; return dict of results."""
+	nodes = [(node, tree) for tree in trees
+			for node in tree.iterfind('.//node[@lemma="het"]')]
+	clf = load(clfpath)
+	pipeline = load(pipelinepath)
+	vectorizer = FeatureVectorizer(pipeline)
+	engine = ForestEngine(clf)
+	rows = [featureDict(node, tree) for node, tree in nodes]
+	checkbatch(clf, pipeline, vectorizer, engine, rows[:samples])
+	X = vectorizer.transform(rows)
+	Xrows = [X[n] for n in range(X.shape[0])]
+
+	def features(nodes):
+		# start without cached tree indices, as for a new document; also
+		# for a single row, so that both time the same work
+		treeIndex.cache_clear()
+		return [featureDict(node, tree) for node, tree in nodes]
+
+	def classify(nodes):
+		# a new model without cache, so that every row is classified
+		model = PleonasticModel(clfpath, pipelinepath)
+		model.clf, model.pipeline = engine, vectorizer
+		return model.classify(nodes)
+
+	stages = [
+			("featureDict", features, lambda a: features([a]), nodes),
+			("pipeline.transform", lambda a: pipeline.transform(
+				dataframe(a)),
+				lambda a: pipeline.transform(dataframe([a])), rows),
+			("vectorizer.transform", vectorizer.transform,
+				lambda a: vectorizer.transform([a]), rows),
+			("clf.predict", lambda _: clf.predict(X), clf.predict, Xrows),
+			("engine.predict", lambda _: engine.predict(X), engine.predict,
+				Xrows),
+			("classify", classify, lambda a: classify([a]), nodes),
+			]
+	results = {}
+	for name, batch, single, items in stages:
+		results[name] = measure(batch, single, items, samples)
+		print("%-22s %8d rows %10.0f rows/s %8.3f ms p50 %8.3f ms p99 "
+				"%10.0f KB" % (name, results[name]["rows"],
+				results[name]["rows_per_sec"], results[name]["p50_ms"],
+				results[name]["p99_ms"], results[name]["peak_kb"]))
+	return results
+
+
+def main():
+	"""CLI"""
+	longopts = ['trees=', 'copies=', 'samples=', 'model=', 'pipeline=',
+			'output=', 'help']
+	try:
+		opts, args = getopt.gnu_getopt(sys.argv[1:], '', longopts)
+	except getopt.GetoptError:
+		print(__doc__)
+		return
+	opts = dict(opts)
+	if '--help' in opts:
+		print(__doc__)
+		return
+	treedir = opts.get('--trees', os.path.join(
+			os.path.dirname(os.path.abspath(__file__)), 'data', 'benchmark'))
+	copies = int(opts.get('--copies', 100))
+	filenames = sorted(glob(os.path.join(treedir, '*.xml')))
+	# distinct copies, so that nothing is cached between them
+	trees = [etree.parse(filename) for _ in range(copies)
+			for filename in filenames]
+	results = dict(
+			environment=dict(
+				python=platform.python_version(),
+				numpy=np.__version__,
+				sklearn=sklearn.__version__,
+				machine=platform.machine(),
+				processor=platform.processor()),
+			trees=len(trees),
+			stages=benchmark(trees,
+				opts.get('--model', 'pleonastic/data.joblib'),
+				opts.get('--pipeline', 'pleonastic/pipeline.joblib'),
+				int(opts.get('--samples', 200))))
+	with open(opts.get('--output', 'benchmark.json'), 'w') as out:
+		json.dump(results, out, indent=2)
+
+
+if __name__ == '__main__':
+	main()
@@ -1,36 +1,17 @@
 import os
-import pandas as pd
 
-data = []
+from pleonastic.dataset import combineDatasets
 
-#path = "data/sonar/csv/"
-path = "data/riddlecoref/csv/"
+#path = "data/sonar/npz/"
+path = "data/riddlecoref/npz/"
 
-#out = "data/sonar/csv/all.csv"
-out = "data/riddlecoref/csv/all.csv"
+#out = "data/sonar/npz/all.npz"
+out = "data/riddlecoref/npz/all.npz"
 
 if os.path.isfile(out):
-    print("The file all.csv already exists. Delete it first before running.")
+    print("The file all.npz already exists. Delete it first before running.")
 else:
-    for filename in os.listdir(path):
-        try:
-            csv = pd.read_csv(path + filename, sep = ";")
-            data.append(csv)
-    
-        except pd.errors.EmptyDataError:
-            pass
-    
-    df = pd.concat(data, sort=True)
-    
-    cols = list(df.columns.values)
-    cols.pop(cols.index("old"))
-    cols.pop(cols.index("pleonastic"))
-    cols.append("old")
-    cols.append("pleonastic")
-    
-    ndf = df[cols]
-    ndf = ndf.fillna("None")
-
-    print("Number of words in the dataset: {}".format(len(ndf)))
-    ndf.to_csv(out, sep = ";", encoding = "utf-8", index = False)
-    
+    filenames = [path + filename for filename in sorted(os.listdir(path))]
+    counts = combineDatasets(filenames, out, "pleonastic",
+            last = ("old", "pleonastic"))
+    print("Number of words in the dataset: {}".format(sum(counts.values())))
@@ -1,42 +1,23 @@
 import os
-import pandas as pd
+import sys
 
-data = []
+from pleonastic.dataset import combineDatasets
 
-path = "data/sonar/csv/"
-#path = "data/riddlecoref/csv/"
+path = "data/sonar/npz/"
+#path = "data/riddlecoref/npz/"
 
-out = "data/sonar/csv/all.csv"
-#out = "data/riddlecoref/csv/all.csv"
+out = "data/sonar/npz/all.npz"
+#out = "data/riddlecoref/npz/all.npz"
+
+# seed for the random sample of each class
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
 
 if os.path.isfile(out):
-	print("The file all.csv already exists. Delete it first before running.")
+	print("The file all.npz already exists. Delete it first before running.")
 else:
-	for filename in os.listdir(path):
-		try:
-			csv = pd.read_csv(path + filename, sep = ";")
-			data.append(csv)
-	
-		except pd.errors.EmptyDataError:
-			pass
-
-	df = pd.concat(data, sort=True)
-
-	cols = list(df.columns.values)
-	cols.pop(cols.index("old"))
-	cols.pop(cols.index("pleonastic"))
-	cols.append("old")
-	cols.append("pleonastic")
-
-	df = df[cols]
-
-	nm = df.loc[df["pleonastic"] == 0]
-
-	n = len(nm)
-	print(n)
-	pl = df.loc[df["pleonastic"] == 1][:n]
-
-	ndf = pd.concat([pl, nm])
-	ndf = ndf.fillna("None")
-	print("Number of words in the dataset: {}".format(len(ndf)))
-	ndf.to_csv(out, sep = ";", encoding = "utf-8", index = False)
+	filenames = [path + filename for filename in sorted(os.listdir(path))]
+	# the same number of pleonastic and non-pleonastic pronouns
+	counts = combineDatasets(filenames, out, "pleonastic",
+			last = ("old", "pleonastic"), balance = True, seed = seed)
+	print(counts[0])
+	print("Number of words in the dataset: {}".format(sum(counts.values())))
@@ -0,0 +1,176 @@
+"""Write the features for pleonastic pronouns of a whole corpus to one file.
+
+Usage: python3 convert_corpus.py [options] <directory>...
+where each directory contains the .xml files of one document, parsed by
+Alpino, with a CoNLL file of the same name in the gold directory of each
+corpus (see CORPORA in convert_csv.py).
+
+The rows of each document are stored in a dataset of its own for each
+corpus, as convert_csv.py does; with several corpora, the features of a
+document are extracted once and labeled with the gold coreference of each.
+A manifest records the hashes of the XML and CoNLL files of every document
+and a fingerprint of the feature extraction code; documents for which
+neither changed are not extracted again. The lexicons are only read if
+there is something to extract; documents are processed in parallel.
+
+The rows of all documents, in the order of the arguments, are then written
+to the output of each corpus, a dataset as written by
+pleonastic.dataset.saveDataset(); if its name ends in .csv, a
+semicolon-separated csv file is written instead.
+
+Options:
+	--corpus=<sonar,riddlecoref>    one or more corpora, separated by commas;
+			determines the gold coreference and labeling (default: sonar)
+	--jobs=N        number of processes (default: number of CPUs)
+	--output=<file> output file (default: data/<corpus>/corpus.npz)
+	--manifest=<file>   (default: data/<corpus>/manifest.json)
+			--output and --manifest can only be given with a single corpus.
+	--force         extract all documents, even if they did not change
+"""
+import os
+import sys
+import glob
+import json
+import getopt
+import hashlib
+import tempfile
+import multiprocessing
+
+import convert_csv as converter
+from pleonastic.dataset import combineDatasets, loadDataset, saveDataset
+
+ngdata = gadata = None
+
+
+def initworker(ngdata_, gadata_):
+	"""Make the lexicons available to a worker process."""
+	global ngdata, gadata
+	ngdata, gadata = ngdata_, gadata_
+
+
+def extractdocument(job):
+	"""Extract the feature rows of one document and store them."""
+	path, corpora = job
+	rows = converter.extract(path, ngdata, gadata, corpora)
+	for corpus in corpora:
+		saveDataset(converter.datasetfile(path, corpus), rows[corpus])
+	return path
+
+
+def hashfiles(filenames):
+	"""Return a hash of the names and contents of the given files."""
+	h = hashlib.sha1()
+	for filename in filenames:
+		h.update(os.path.basename(filename).encode('utf8'))
+		with open(filename, 'rb') as inp:
+			h.update(inp.read())
+	return h.hexdigest()
+
+
+def fingerprint():
+	"""Return a hash of the code that produces the feature rows: the
+	converter with its labeling, the feature extraction modules and the
+	encoding of the stored datasets."""
+	names = [converter.__name__, 'pleonastic.feature_dict',
+			'pleonastic.feature_extractor', 'pleonastic.dataset',
+			'development.old_pleonastic']
+	return hashfiles(sys.modules[name].__file__ for name in names)
+
+
+def documentstate(path, corpus, extractor):
+	"""Return what the rows of a document are extracted from."""
+	return dict(
+			xml=hashfiles(sorted(glob.glob(os.path.join(path, '*.xml')))),
+			conll=hashfiles([converter.goldfile(path, corpus)]),
+			extractor=extractor)
+
+
+def readmanifest(filename):
+	if not os.path.exists(filename):
+		return {}
+	with open(filename, encoding='utf8') as inp:
+		return json.load(inp)
+
+
+def writemanifest(filename, manifest):
+	fd, tmp = tempfile.mkstemp(suffix='.tmp',
+			dir=os.path.dirname(filename) or '.')
+	with os.fdopen(fd, 'w', encoding='utf8') as out:
+		json.dump(manifest, out, indent=1, sort_keys=True)
+	os.chmod(tmp, 0o644)
+	os.replace(tmp, filename)
+
+
+def writecsv(output, filenames):
+	"""Write the rows of the given datasets to a csv file."""
+	header = True
+	with open(output, 'w', encoding='utf-8', newline='') as out:
+		for filename in filenames:
+			df = loadDataset(filename)
+			if len(df.columns):
+				df.to_csv(out, sep=';', index=False, header=header)
+				header = False
+
+
+def main():
+	"""CLI"""
+	try:
+		opts, args = getopt.gnu_getopt(sys.argv[1:], '',
+				['corpus=', 'jobs=', 'output=', 'manifest=', 'force', 'help'])
+	except getopt.GetoptError:
+		print(__doc__)
+		return
+	opts = dict(opts)
+	corpora = opts.get('--corpus', 'sonar').split(',')
+	if ('--help' in opts or not args
+			or not set(corpora) <= set(converter.CORPORA)
+			or len(corpora) > 1 and ('--output' in opts or '--manifest' in opts)):
+		print(__doc__)
+		return
+	jobs = int(opts.get('--jobs', os.cpu_count()))
+
+	extractor = fingerprint()
+	manifests, states = {}, {}
+	for corpus in corpora:
+		manifestfile = opts.get('--manifest', 'data/%s/manifest.json' % corpus)
+		manifests[corpus] = manifestfile, readmanifest(manifestfile)
+		states[corpus] = {path: documentstate(path, corpus, extractor)
+				for path in args}
+	# all corpora of a document are extracted if one of them changed
+	todo = [path for path in args if '--force' in opts or any(
+				manifests[corpus][1].get(converter.docname(path))
+					!= states[corpus][path]
+				or not os.path.exists(converter.datasetfile(path, corpus))
+				for corpus in corpora)]
+	print("Extracting {} of {} documents".format(len(todo), len(args)))
+
+	if todo:
+		# read once; worker processes are started with a copy of the lexicons
+		lexicons = converter.readngdata()
+		with multiprocessing.Pool(jobs, initializer=initworker,
+				initargs=lexicons) as pool:
+			try:
+				for path in pool.imap_unordered(extractdocument,
+						[(path, corpora) for path in todo]):
+					for corpus in corpora:
+						manifests[corpus][1][converter.docname(path)] = (
+								states[corpus][path])
+			finally:
+				# keep track of the documents that are done if one fails
+				for manifestfile, manifest in manifests.values():
+					writemanifest(manifestfile, manifest)
+
+	for corpus in corpora:
+		output = opts.get('--output', 'data/%s/corpus.npz' % corpus)
+		filenames = [converter.datasetfile(path, corpus) for path in args]
+		if output.endswith('.csv'):
+			writecsv(output, filenames)
+		else:
+			combineDatasets(filenames, output, 'pleonastic',
+					last=('old', 'pleonastic'))
+		print("Wrote features for {} documents to {}".format(
+				len(args), output))
+
+
+if __name__ == '__main__':
+	main()
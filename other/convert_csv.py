@@ -1,7 +1,15 @@
 """
 Edited version of coref.py
 
-Writes the features for pleonastic pronouns to a csv
+Writes the features for pleonastic pronouns of a document to a dataset.
+
+Usage: python3 convert_csv.py [--corpus=<sonar,riddlecoref>] [--slice=N:M]
+	<directory>
+where directory contains the .xml files of one document, parsed by Alpino.
+The trees are parsed and the features extracted once; the rows are labeled
+with the gold coreference of each corpus given with --corpus (default:
+sonar), read from a CoNLL file of the same name as the directory (see
+CORPORA), and written to a dataset for each corpus.
 """
 
 import io
@@ -22,9 +30,9 @@ from lxml import etree
 from jinja2 import Template
 import colorama
 import ansi2html
-import pandas as pd
 
 
+from pleonastic.dataset import saveDataset
 from pleonastic.feature_dict import *
 from development.old_pleonastic import *
 
@@ -39,6 +47,15 @@ STOPWORDS = (
 		'bc. dr drs ing ir mr lic prof mevr mw bacc kand dr.h.c ds bc '
 		'mevrouw meneer heer doctor professor').split()
 
+# For each corpus: the directory with the CoNLL files with gold coreference,
+# the directory where the datasets are written, and the minimum size of a
+# gold cluster for a "het" in it to be labeled as not pleonastic. SoNaR
+# annotates singleton mentions; RiddleCoref does not.
+CORPORA = {
+		'sonar': ('data/sonar/conll/', 'data/sonar/npz/', 2),
+		'riddlecoref': ('data/riddlecoref/coref/', 'data/riddlecoref/npz/', 1),
+		}
+
 VERBOSE = False
 DEBUGFILE = sys.stdout
 
@@ -210,7 +227,7 @@ class Quotation:
 		self.text = text
 
 
-def getmentions(gold, trees, ngdata, gadata):
+def getmentions(golds, trees, ngdata, gadata):
 	"""Collect mentions."""
 	debug(color('mention detection', 'yellow'))
 	mentionlist = list()
@@ -230,14 +247,14 @@ def getmentions(gold, trees, ngdata, gadata):
 		candidates.extend(tree.xpath('.//node[@pt="det" and @rel!="det"]'))
 		covered = set()
 		for candidate in candidates:
-			mentiondict = considermention(gold, candidate, tree, sentno, covered,
+			mentiondict = considermention(golds, candidate, tree, sentno, covered,
 					ngdata, gadata)
 			if mentiondict is not None:
 				mentionlist.append(mentiondict)
 	return mentionlist
 
 
-def considermention(gold, node, tree, sentno, covered, ngdata, gadata):
+def considermention(golds, node, tree, sentno, covered, ngdata, gadata):
 	"""Decide whether a candidate mention should be added."""
 	if len(node) == 0 and 'word' not in node.keys():
 		return
@@ -294,41 +311,45 @@ def considermention(gold, node, tree, sentno, covered, ngdata, gadata):
 	if head.get('lemma') in ('aantal', 'keer', 'toekomst', 'manier'):
 		return
 		
-	mentiondict = pleonasticpronoun(node, sentno, gold, tree)
+	mentiondict = pleonasticpronoun(node, sentno, golds, tree)
 	
 	return mentiondict
 
 ########################################################################
 
-def pleonasticpronoun(node, sentno, gold, tree):
+def pleonasticpronoun(node, sentno, golds, tree):
+	"""Return a dict with the feature row of a "het" node for each corpus.
+
+	:param golds: dict mapping corpus names to the gold cluster sizes of the
+		document, as returned by clustersizes()."""
 	if node.get("lemma") == "het":
-		f_dict = featureDict(node, tree)
-
-		pleonastic = True
-		for i in gold:
-			if (int(sentno), int(node.attrib["begin"]), 
-				int(node.attrib["end"]), node.attrib["word"]) in gold[i]:
-					#pleonastic = False
-					if len(gold[i]) > 1:
-						pleonastic = False
-		if pleonastic == False:
-			f_dict["pleonastic"] = 0
-		else:
-			f_dict["pleonastic"] = 1
-	
+		features = featureDict(node, tree)
 		if oldpleonasticpronoun(node) == True:
-			f_dict["old"] = 1
+			old = 1
 		else:
-			f_dict["old"] = 0
+			old = 0
+		span = (int(sentno), int(node.attrib["begin"]),
+				int(node.attrib["end"]), node.attrib["word"])
+
+		rows = {}
+		for corpus, gold in golds.items():
+			minsize = CORPORA[corpus][2]
+			f_dict = features.copy()
+			if gold.get(span, 0) >= minsize:
+				f_dict["pleonastic"] = 0
+			else:
+				f_dict["pleonastic"] = 1
+			f_dict["old"] = old
+			rows[corpus] = f_dict
 
-		return f_dict
+		return rows
 
 ########################################################################
 
-def resolvecoreference(gold, trees, ngdata, gadata, mentions=None):
+def resolvecoreference(golds, trees, ngdata, gadata, mentions=None):
 	"""Get mentions and apply coreference sieves."""
 	if mentions is None:
-		mentionlist = getmentions(gold, trees, ngdata, gadata)
+		mentionlist = getmentions(golds, trees, ngdata, gadata)
 	return mentionlist
 
 
@@ -690,7 +711,18 @@ def conllclusterdict(conlldata):
 						% (a, b[0][2]))
 	return spansforcluster
 
-def process(gold, path, output, ngdata, gadata,
+def clustersizes(spansforcluster):
+	"""Map each gold span to the size of the largest cluster it is part of.
+
+	Labeling a candidate is then a single lookup instead of a pass over all
+	clusters of the document."""
+	sizes = {}
+	for spans in spansforcluster.values():
+		for span in spans:
+			sizes[span] = max(sizes.get(span, 0), len(spans))
+	return sizes
+
+def process(golds, path, output, ngdata, gadata,
 		docname='-', conllfile=None, fmt=None,
 		start=None, end=None, startcluster=0,
 		goldmentions=False, exclude=(), outputprefix=None):
@@ -702,43 +734,68 @@ def process(gold, path, output, ngdata, gadata,
 	trees = [(parsesentid(filename), etree.parse(filename))
 			for filename in filenames]
 	mentions = None
-	mentionlist = resolvecoreference(gold, trees, ngdata, gadata, mentions)
+	mentionlist = resolvecoreference(golds, trees, ngdata, gadata, mentions)
 
 	return mentionlist
 
+def docname(path):
+	"""Return the name of the document in directory path."""
+	return str(path.rstrip("/").split("/")[-1:]).strip("[']")
+
+
+def goldfile(path, corpus='sonar'):
+	"""Return the CoNLL file with the gold coreference for a document."""
+	return CORPORA[corpus][0] + docname(path) + ".conll"
+
+
+def datasetfile(path, corpus='sonar'):
+	"""Return the file with the feature rows of a document."""
+	return CORPORA[corpus][1] + docname(path) + ".npz"
+
+
+def extract(path, ngdata, gadata, corpora=('sonar', ), start=None, end=None):
+	"""Return the feature rows for the "het" nodes of a single document.
+
+	:param path: directory with Alpino XML parses; its name is used to find
+		the CoNLL file with the gold coreference of each corpus.
+	:param corpora: the names of the corpora whose gold coreference is used
+		to label the rows; the features are extracted only once.
+	:returns: dict mapping each corpus name to a list of feature rows."""
+	filename = docname(path)
+	golds = {}
+	for corpus in corpora:
+		conll = readconll(goldfile(path, corpus))
+		golds[corpus] = clustersizes(conllclusterdict(conll))
+	
+	print("Working on {}".format(filename))
+	mentionlist = process(golds, path, sys.stdout, ngdata, gadata,
+			start=start, end=end,
+			docname=os.path.basename(path.rstrip('/')))
+	return {corpus: [rows[corpus] for rows in mentionlist]
+			for corpus in corpora}
+
+
 def main():
 	"""CLI"""
 	opts, args = gnu_getopt(sys.argv[1:], '', [
 		'help', 'verbose', 'clindev', 'semeval', 'test', 'goldmentions',
-		'fmt=', 'slice=', 'gold=', 'exclude=', 'outputprefix='])
+		'fmt=', 'slice=', 'gold=', 'exclude=', 'outputprefix=', 'corpus='])
 	opts = dict(opts)
+	corpora = opts.get('--corpus', 'sonar').split(',')
+	if '--help' in opts or not args or not set(corpora) <= set(CORPORA):
+		print(__doc__)
+		return
 	ngdata, gadata = readngdata()
 	start, end = opts.get('--slice', ':').split(':')
 	start = int(start) if start else None
 	end = int(end) if end else None
 	path = args[0]
-	exclude = [a for a in opts.get('--exclude', '').split(',') if a]
 	
-	filename = str(path.split("/")[-1:]).strip("[']")
-	new_path = "data/sonar/conll/" + filename + ".conll"
-	#new_path = "data/riddlecoref/coref/" + filename + ".conll"
+	p = extract(path, ngdata, gadata, corpora, start=start, end=end)
 
-	conll = readconll(new_path)
-	gold = conllclusterdict(conll)
-	
-	print("Working on {}".format(filename))
-	p = process(gold, path, sys.stdout, ngdata, gadata,
-			fmt=opts.get('--fmt'), start=start, end=end,
-			docname=os.path.basename(path.rstrip('/')),
-			conllfile=opts.get('--gold'),
-			goldmentions='--goldmentions' in opts,
-			exclude=exclude)
-
-	print("Creating csv")
-	df = pd.DataFrame(p)
-
-	df.to_csv("data/sonar/csv/" + filename + ".csv", sep = ";", encoding = "utf-8", index = False)
-	#df.to_csv("data/riddlecoref/csv/" + filename + ".csv", sep = ";", encoding = "utf-8", index = False)
+	print("Creating dataset")
+	for corpus in corpora:
+		saveDataset(datasetfile(path, corpus), p[corpus])
 
 if __name__ == '__main__':
 	main()
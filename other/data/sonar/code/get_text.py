@@ -2,50 +2,75 @@
 
 import argparse
 import os
+import time
+from multiprocessing import Pool
 from pathlib import Path
 
-# start arguments #
-parser = argparse.ArgumentParser(add_help=True)
-
-parser.add_argument(
-    "-p0",
-    help="Set CONLL path",
-    type=Path,
-    required=False,
-    default=Path.cwd())
-    
-parser.add_argument(
-    "-p1",
-    help="Set IOB path",
-    type=Path,
-    required=True)
-
-args = parser.parse_args()
-p0 = args.p0
-p1 = args.p1
-
-
-# end arguments #
-
-for filename in os.listdir(p0):
-    
-    f = str(filename[:-6])
-    
-    iobfile = f + ".iob"
-    try:
-        with open(p1 / iobfile)as iob:
-            out = open("txt/"+ f + ".txt","w") 
-            text = str()
-            for line in iob.readlines():
-                text += (line.split("\t")[0] + " ")
-            out.write(text)
-            out.close()
-    except FileNotFoundError:
-        iobfile1 = "wiki-" + iobfile[4:]
-        with open(p1 / iobfile1)as iob:
-            out = open("txt/"+ f + ".txt","w") 
-            text = str()
-            for line in iob.readlines():
-                text += (line.split("\t")[0] + " ")
-            out.write(text)
-            out.close()
+
+def iobpath(p1, f):
+    """Return the IOB file for document f; falls back to the wiki- prefix."""
+    iobfile = p1 / (f + ".iob")
+    if not iobfile.exists():
+        iobfile = p1 / ("wiki-" + (f + ".iob")[4:])
+    return iobfile
+
+
+def extract(job):
+    """Write the tokens of one IOB file to txt/<f>.txt, a line at a time.
+
+    Returns the name of the document, the number of lines and the time
+    it took."""
+    p1, f = job
+    start = time.perf_counter()
+    lines = 0
+    with open(iobpath(p1, f)) as iob, open("txt/" + f + ".txt", "w") as out:
+        for line in iob:
+            out.write(line.split("\t", 1)[0] + " ")
+            lines += 1
+    return f, lines, time.perf_counter() - start
+
+
+def main():
+    # start arguments #
+    parser = argparse.ArgumentParser(add_help=True)
+
+    parser.add_argument(
+        "-p0",
+        help="Set CONLL path",
+        type=Path,
+        required=False,
+        default=Path.cwd())
+
+    parser.add_argument(
+        "-p1",
+        help="Set IOB path",
+        type=Path,
+        required=True)
+
+    parser.add_argument(
+        "-j",
+        help="Set number of processes (default: number of CPUs)",
+        type=int,
+        required=False,
+        default=os.cpu_count())
+
+    args = parser.parse_args()
+    p0 = args.p0
+    p1 = args.p1
+    # end arguments #
+
+    jobs = [(p1, str(filename[:-6])) for filename in os.listdir(p0)]
+    start = time.perf_counter()
+    total = 0
+    with Pool(args.j) as pool:
+        for f, lines, seconds in pool.imap_unordered(extract, jobs):
+            total += lines
+            print("%s\t%d lines\t%.3f s\t%.0f lines/s" % (
+                f, lines, seconds, lines / seconds if seconds else 0))
+    seconds = time.perf_counter() - start
+    print("%d files\t%d lines\t%.3f s\t%.0f lines/s" % (
+        len(jobs), total, seconds, total / seconds if seconds else 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,98 @@
 # remove paragrap level markables
+#
+# Usage: python3 rpm.py [directory]   (default: Markables)
+#
+# Writes every *np_level.xml file in the directory again, without the
+# markables that also occur in the paragraph level file of the same
+# document. The files are read and written one markable at a time, and
+# the documents are processed in parallel.
 
 import os
-import xml.etree.ElementTree as ET
-
-
-for filename in os.listdir("Markables"):
-    
-    
-    if filename.endswith("np_level.xml"):
-        f = filename[:-12]
-        paragraph_file = "Markables/" + f + "paragraph_level.xml"
-        paragraph_tree = ET.parse(paragraph_file)
-        paragraph_root = paragraph_tree.getroot()
-        
-        np_tree = ET.parse("Markables/" + filename)
-        np_root = np_tree.getroot()
-        
-        markables = [child.attrib["id"] for child in paragraph_root]
-        
-        for child in np_root:
-            if child.attrib["id"] in markables:
-                np_root.remove(child)
+import sys
+import tempfile
+from multiprocessing import Pool
+from lxml import etree
+
+
+def markableids(filename):
+    """Return the set of ids of the markables in filename."""
+    ids = set()
+    for _, elem in etree.iterparse(filename):
+        if elem.getparent() is not None and elem.getparent().getparent() is None:
+            ids.add(elem.get("id"))
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    return ids
+
+
+def filtermarkables(filename, markables, out):
+    """Write filename to out without the markables with an id in markables.
+
+    Returns the number of markables kept and removed."""
+    kept = removed = 0
+    context = etree.iterparse(filename, events=("start", "end"))
+    _, root = next(context)
+    with etree.xmlfile(out, encoding="UTF-8") as xf:
+        xf.write_declaration()
+        doctype = root.getroottree().docinfo.doctype
+        if doctype:
+            xf.write_doctype(doctype)
+        with xf.element(root.tag, root.attrib, nsmap=root.nsmap):
+            xf.write("\n")
+            depth = 1
+            for event, elem in context:
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue
+                if elem.get("id") in markables:
+                    removed += 1
+                else:
+                    # within the root, so that its namespace is not repeated
+                    with xf.element(elem.tag, elem.attrib):
+                        if elem.text:
+                            xf.write(elem.text)
+                        for child in elem:
+                            xf.write(child)
+                    xf.write("\n")
+                    kept += 1
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del root[0]
+    out.write(b"\n")
+    return kept, removed
+
+
+def process(job):
+    directory, filename = job
+    f = filename[:-12]
+    paragraph_file = os.path.join(directory, f + "paragraph_level.xml")
+    np_file = os.path.join(directory, filename)
+    markables = markableids(paragraph_file)
+
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            kept, removed = filtermarkables(np_file, markables, out)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, np_file)
+    return filename, kept, removed
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else "Markables"
+    jobs = [(directory, filename) for filename in sorted(os.listdir(directory))
+            if filename.endswith("np_level.xml")]
+    with Pool() as pool:
+        for filename, kept, removed in pool.imap_unordered(process, jobs):
+            print("%s\t%d kept\t%d removed" % (filename, kept, removed))
+
+
+if __name__ == "__main__":
+    main()
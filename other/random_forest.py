@@ -1,34 +1,212 @@
-import pandas as pd
+"""Train the pleonastic pronoun classifier.
+
+Usage: python3 random_forest.py [--compact|--search]
+
+The dataset transformed by the pipeline is stored in MATRIX, together with
+a hash of the dataset and the pipeline definition; later runs reuse it as
+long as neither changed.
+
+With --compact, forests with fewer and smaller trees, limited in depth
+(DEPTHS) and number of leaves (LEAVES), are compared to the full forest
+with cross-validation; for each candidate, the F1 score,
+inference latency and model size are reported, and the smallest model with
+an F1 score within TOLERANCE of the full forest is stored instead.
+
+With --search, all combinations of the parameters in GRID are
+cross-validated in a process pool; the combinations are listed by F1 score
+and the best one is trained and stored instead.
+"""
+import io
+import os
+import sys
+import time
+import hashlib
+import itertools
+import multiprocessing
+import numpy as np
+
+import joblib
 
 from joblib import dump, load
+from scipy import sparse
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.metrics import f1_score
+from sklearn.model_selection import cross_val_score, train_test_split
 
+from pleonastic.dataset import loadDataset
+from pleonastic.forest import ForestEngine
 from pleonastic.pipeline import *
 
-csv = "data/sonar/csv/all.csv"
-#csv = "data/riddlecoref/csv/all.csv"
-df = pd.read_csv(csv, sep = ";")
+DATASET = "data/sonar/npz/all.npz"
+#DATASET = "data/riddlecoref/npz/all.npz"
+MATRIX = "data/sonar/matrix.joblib"
+#MATRIX = "data/riddlecoref/matrix.joblib"
+
+TREES = (10, 25, 50, 100, 200)
+DEPTHS = (4, 6, 8, None)
+LEAVES = (8, 16, 32, None)
+TOLERANCE = 0.005
+FOLDS = 5
+
+GRID = dict(
+		n_estimators = (100, 250, 500),
+		max_leaf_nodes = (8, 16, 32, None),
+		class_weight = ({0:8, 1:1}, "balanced", None),
+		max_features = (None, "sqrt"))
+
+
+def forest(n_estimators=500, max_depth=None, n_jobs=-1, **params):
+	params = dict(dict(max_leaf_nodes = 16, max_features = None,
+			class_weight = {0:8, 1:1}), **params)
+	return RandomForestClassifier(n_estimators = n_estimators,
+									max_depth = max_depth,
+									n_jobs = n_jobs, **params)
+
+
+def preprocess(dataset, matrix):
+	"""Return the fitted pipeline, the transformed dataset and the labels.
+
+	The result is stored in matrix and reused if the dataset and the
+	definition of the pipeline did not change."""
+	with open(dataset, "rb") as inp:
+		key = joblib.hash((hashlib.sha1(inp.read()).hexdigest(), full_pipeline))
+	if os.path.exists(matrix):
+		cachedkey, result = load(matrix)
+		if cachedkey == key:
+			return result
+	df = loadDataset(dataset)
+
+	n = len(df.columns)
+
+	X = df.iloc[:, 0: n-2]
+	y = df.iloc[:, n-1]
+
+	pipeline = full_pipeline
+	X_prep = pipeline.fit_transform(X)
+	result = pipeline, X_prep, y.to_numpy()
+	dump((key, result), matrix)
+	return result
+
+
+def initworker(X_, y_):
+	"""Make the training data available to a worker process."""
+	global X_search, y_search
+	X_search, y_search = X_, y_
+
+
+def crossvalidate(params):
+	"""Return params with mean and standard deviation of the macro F1
+	score of a forest with these parameters."""
+	cv = cross_val_score(forest(n_jobs = 1, **params), X_search, y_search,
+			cv = FOLDS, scoring = "f1_macro")
+	return params, cv.mean(), cv.std()
+
+
+def search(X_train, y_train):
+	"""Cross-validate all combinations of parameters in GRID in parallel;
+	print them ranked by F1 score and return the best parameters."""
+	combinations = [dict(zip(GRID, values))
+			for values in itertools.product(*GRID.values())]
+	with multiprocessing.Pool(initializer = initworker,
+			initargs = (X_train, y_train)) as pool:
+		results = pool.map(crossvalidate, combinations, chunksize = 1)
+	results.sort(key = lambda result: result[1], reverse = True)
+	print("rank\tcv_f1\tcv_std\t" + "\t".join(GRID))
+	for rank, (params, mean, std) in enumerate(results, 1):
+		print("%d\t%.4f\t%.4f\t%s" % (rank, mean, std,
+				"\t".join(str(params[name]) for name in GRID)))
+	return results[0][0]
+
+
+def measure(classifier, X_train, y_train, X_test, y_test):
+	"""Cross-validate and fit classifier; return a dict with its macro F1
+	scores, latency of ForestEngine and size of the stored model."""
+	cv = cross_val_score(classifier, X_train, y_train, cv = FOLDS,
+			scoring = "f1_macro", n_jobs = -1)
+	classifier.fit(X_train, y_train)
+	engine = ForestEngine(classifier)
+	X_test = sparse.csr_matrix(X_test)
+
+	start = time.perf_counter()
+	engine.predict_proba(X_test)
+	batch = time.perf_counter() - start
+
+	rows = min(X_test.shape[0], 200)
+	latencies = []
+	for n in range(rows):
+		start = time.perf_counter()
+		engine.predict_proba(X_test[n])
+		latencies.append(time.perf_counter() - start)
+
+	buf = io.BytesIO()
+	dump(classifier, buf)
+	return dict(
+			trees = classifier.n_estimators,
+			depth = classifier.max_depth,
+			leaves = classifier.max_leaf_nodes,
+			cv_f1 = cv.mean(),
+			cv_std = cv.std(),
+			test_f1 = f1_score(y_test, engine.predict(X_test),
+				average = "macro"),
+			row_ms = 1000 * np.median(latencies),
+			batch_ms = 1000 * batch,
+			size_kb = len(buf.getvalue()) / 1024)
+
+
+def main():
+	pipeline, X_prep, y = preprocess(DATASET, MATRIX)
+
+	X_train, X_test, y_train, y_test = train_test_split(X_prep, y)
 
-n = len(df.columns)
+	if "--compact" in sys.argv[1:]:
+		# the folds are evaluated in parallel, so train each forest on one core
+		classifier = forest(n_jobs = 1)
+		full = measure(classifier, X_train, y_train, X_test, y_test)
+		candidates = [(full, classifier)]
+		for n_estimators in TREES:
+			for max_depth, max_leaf_nodes in itertools.product(DEPTHS, LEAVES):
+				# a tree of depth d has at most 2 ** d leaves; a larger
+				# limit gives the same forest as no limit
+				if (max_depth is not None and max_leaf_nodes is not None
+						and max_leaf_nodes >= 2 ** max_depth):
+					continue
+				candidate = forest(n_estimators, max_depth, n_jobs = 1,
+						max_leaf_nodes = max_leaf_nodes)
+				candidates.append((measure(
+						candidate, X_train, y_train, X_test, y_test), candidate))
 
-X = df.iloc[:, 0: n-2]
-y = df.iloc[:, n-1]
+		print("trees\tdepth\tleaves\tcv_f1\tcv_std\ttest_f1\trow_ms\tbatch_ms\t"
+				"size_kb")
+		for result, _ in candidates:
+			print("%(trees)d\t%(depth)s\t%(leaves)s\t%(cv_f1).4f\t%(cv_std).4f\t"
+					"%(test_f1).4f\t%(row_ms).3f\t%(batch_ms).2f\t%(size_kb).0f"
+					% result)
 
-pipeline = full_pipeline
-X_prep = pipeline.fit_transform(X)
+		result, classifier = min(
+				(candidate for candidate in candidates
+					if candidate[0]["cv_f1"] >= full["cv_f1"] - TOLERANCE),
+				key = lambda candidate: candidate[0]["size_kb"])
+		print("Selected %(trees)d trees, max depth %(depth)s, max leaves "
+				"%(leaves)s: F1 %(cv_f1).4f "
+				"(full forest: %(full).4f), %(size_kb).0f KB" % dict(
+					result, full = full["cv_f1"]))
+	elif "--search" in sys.argv[1:]:
+		params = search(X_train, y_train)
+		classifier = forest(**params)
+		classifier.fit(X_train, y_train)
+		print("Selected %s: test F1 %.4f" % (params, f1_score(
+				y_test, classifier.predict(X_test), average = "macro")))
+	else:
+		classifier = forest()
+		classifier.fit(X_train, y_train)
 
-X_train, X_test, y_train, y_test = train_test_split(X_prep, y)
+		y_pred = classifier.predict(X_test)
 
-classifier = RandomForestClassifier(n_estimators = 500,
-									max_leaf_nodes = 16,
-									n_jobs = -1, max_features = None,
-									class_weight = {0:8, 1:1})
-classifier.fit(X_train, y_train)
+	dump(classifier, "pleonastic/data.joblib")
+	#dump(classifier, "pleonastic/data_riddle.joblib")
+	dump(pipeline, "pleonastic/pipeline.joblib")
+	#dump(pipeline, "pleonastic/pipeline_riddle.joblib")
 
-y_pred = classifier.predict(X_test)  
 
-dump(classifier, "pleonastic/data.joblib")
-#dump(classifier, "pleonastic/data_riddle.joblib")
-dump(pipeline, "pleonastic/pipeline.joblib")
-#dump(pipeline, "pleonastic/pipeline_riddle.joblib")
+if __name__ == "__main__":
+	main()
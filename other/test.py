@@ -1,149 +1,90 @@
-import pandas as pd
+"""Evaluate pleonastic pronoun classifiers on the combined datasets.
 
+Usage: python3 test.py [<model.joblib>,<pipeline.joblib> ...]
 
-from joblib import dump, load
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-
-print("Trained on SoNaR1")
-
-clf = load("pleonastic/data.joblib")
-pipeline = load("pleonastic/pipeline.joblib")
-
-riddle = True
-sonar = True
-
-if riddle:
-	print("Riddlecoref")
-
-	csv = "data/riddlecoref/csv/all.csv"
-	df = pd.read_csv(csv, sep = ";")
-
-	n = len(df.columns)
-
-	X = df.iloc[:, 0: n-2]
-	x = df.iloc[:, n-2]
-	y = df.iloc[:, n-1]
-
-	X_prep = pipeline.transform(X)
-	pred = clf.predict(X_prep)	
-
-	print("RandomForestClassifier")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, pred))
-	print("Performance:")
-	print(classification_report(y, pred))
-	print("Overall accuracy:")
-	print(accuracy_score(y, pred))
+Evaluates every model (default: MODELS) on every dataset in DATASETS, and
+compares them with the original pleonastic pronoun function (the "old"
+column). Each dataset is read once and transformed once per distinct
+pipeline; the models predict one after another, so that the rows/s of a
+model do not depend on the other models.
+"""
+import sys
+import time
+import joblib
 
-	print("\n")
-	print("Original pleonastic pronoun function:")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, x))
-	print("Performance:")
-	print(classification_report(y, x))
-	print("Overall accuracy:")
-	print(accuracy_score(y, x))
-	print("\n")
-
-if sonar:
-	print("Sonar")
-	csv = "data/sonar/csv/all.csv"
-	df = pd.read_csv(csv, sep = ";")
-
-	n = len(df.columns)
-
-	X = df.iloc[:, 0: n-2]
-	x = df.iloc[:, n-2]
-	y = df.iloc[:, n-1]
-
-	X_prep = pipeline.transform(X)
-	pred = clf.predict(X_prep)	
-
-	print("RandomForestClassifier")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, pred))
-	print("Performance:")
-	print(classification_report(y, pred))
-	print("Overall accuracy:")
-	print(accuracy_score(y, pred))
-	print("\n")
-	print("Original pleonastic pronoun function:")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, x))
-	print("Performance:")
-	print(classification_report(y, x))
-	print("Overall accuracy:")
-	print(accuracy_score(y, x))
-	print("\n")
-
-print("Trained on riddlecoref")
-
-
-clf = load("pleonastic/data_riddle.joblib")
-pipeline = load("pleonastic/pipeline_riddle.joblib")
-
-riddle = True
-sonar = True
-
-if riddle:
-	print("Riddlecoref")
+from joblib import load
+from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 
-	csv = "data/riddlecoref/csv/all.csv"
-	df = pd.read_csv(csv, sep = ";")
+from pleonastic.dataset import loadDataset
 
-	n = len(df.columns)
+MODELS = [
+	("pleonastic/data.joblib", "pleonastic/pipeline.joblib"),
+	("pleonastic/data_riddle.joblib", "pleonastic/pipeline_riddle.joblib"),
+]
 
-	X = df.iloc[:, 0: n-2]
-	x = df.iloc[:, n-2]
-	y = df.iloc[:, n-1]
+DATASETS = [
+	("Riddlecoref", "data/riddlecoref/npz/all.npz"),
+	("Sonar", "data/sonar/npz/all.npz"),
+]
 
-	X_prep = pipeline.transform(X)
-	pred = clf.predict(X_prep)	
 
-	print("RandomForestClassifier")
+def report(name, y, pred, seconds=None):
+	print(name)
 	print("Confusion matrix:")
 	print(confusion_matrix(y, pred))
 	print("Performance:")
 	print(classification_report(y, pred))
 	print("Overall accuracy:")
 	print(accuracy_score(y, pred))
+	if seconds is not None:
+		print("Rows/s:")
+		print("%.0f" % (len(y) / seconds if seconds else 0))
 	print("\n")
-	print("Original pleonastic pronoun function:")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, x))
-	print("Performance:")
-	print(classification_report(y, x))
-	print("Overall accuracy:")
-	print(accuracy_score(y, x))
-	print("\n")
-
-if sonar:
-	print("Sonar")
-	csv = "data/sonar/csv/all.csv"
-	df = pd.read_csv(csv, sep = ";")
-
-	n = len(df.columns)
-
-	X = df.iloc[:, 0: n-2]
-	x = df.iloc[:, n-2]
-	y = df.iloc[:, n-1]
 
-	X_prep = pipeline.transform(X)
-	pred = clf.predict(X_prep)	
 
-	print("RandomForestClassifier")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, pred))
-	print("Performance:")
-	print(classification_report(y, pred))
-	print("Overall accuracy:")
-	print(accuracy_score(y, pred))
-	print("\n")
-	print("Original pleonastic pronoun function:")
-	print("Confusion matrix:")
-	print(confusion_matrix(y, x))
-	print("Performance:")
-	print(classification_report(y, x))
-	print("Overall accuracy:")
-	print(accuracy_score(y, x))
-	print("\n")
+def main():
+	models = [tuple(a.split(",")) for a in sys.argv[1:]] or MODELS
+	classifiers = [load(clf) for clf, _ in models]
+	# models trained together share a pipeline; transform once for each
+	pipelines = {}
+	pipelinekeys = []
+	for _, filename in models:
+		pipeline = load(filename)
+		key = joblib.hash(pipeline)
+		pipelines.setdefault(key, pipeline)
+		pipelinekeys.append(key)
+
+	for dataname, dataset in DATASETS:
+		df = loadDataset(dataset)
+
+		n = len(df.columns)
+
+		X = df.iloc[:, 0: n-2]
+		x = df.iloc[:, n-2]
+		y = df.iloc[:, n-1]
+
+		transformed = {}
+		for key, pipeline in pipelines.items():
+			start = time.perf_counter()
+			X_prep = pipeline.transform(X)
+			transformed[key] = X_prep, time.perf_counter() - start
+
+		# one at a time; the forests already use several cores
+		results = []
+		for classifier, key in zip(classifiers, pipelinekeys):
+			X_prep, _ = transformed[key]
+			start = time.perf_counter()
+			pred = classifier.predict(X_prep)
+			results.append((pred, time.perf_counter() - start))
+
+		print(dataname)
+		print("\n")
+		for (clf, _), key, (pred, seconds) in zip(
+				models, pipelinekeys, results):
+			report("RandomForestClassifier ({})".format(clf), y, pred,
+					transformed[key][1] + seconds)
+		report("Original pleonastic pronoun function:", y, x)
+
+
+if __name__ == "__main__":
+	main()
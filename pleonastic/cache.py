@@ -0,0 +1,76 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+from collections import OrderedDict
+
+
+class PredictionCache:
+	"""Bounded LRU cache of forest verdicts, keyed by hashed feature values.
+
+	Many "het" contexts recur verbatim across a corpus; their feature rows
+	are identical, and so is the verdict of the forest.
+
+	:ivar hits: number of lookups that found a verdict.
+	:ivar misses: number of lookups that did not.
+	:ivar evictions: number of verdicts dropped because the cache was full."""
+	def __init__(self, maxsize=100000):
+		self.maxsize = maxsize
+		self.entries = OrderedDict()
+		self.hits = self.misses = self.evictions = 0
+
+	@staticmethod
+	def key(features):
+		"""Return a stable hash of a feature dict from featureDict()."""
+		return hashlib.blake2b(repr(tuple(features.items())).encode("utf8"),
+				digest_size=16).digest()
+
+	def get(self, key):
+		"""Return cached value for key, or None."""
+		value = self.entries.get(key)
+		if value is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+			self.entries.move_to_end(key)
+		return value
+
+	def put(self, key, value):
+		"""Store value for key; evict least recently used entries."""
+		self.entries[key] = value
+		self.entries.move_to_end(key)
+		while len(self.entries) > self.maxsize:
+			self.entries.popitem(last=False)
+			self.evictions += 1
+
+	def save(self, filename, fingerprint):
+		"""Write cache to filename.
+
+		:param fingerprint: identifies the model that produced the verdicts;
+			see PleonasticModel.fingerprint()."""
+		fd, tmp = tempfile.mkstemp(suffix=".tmp",
+				dir=os.path.dirname(filename) or ".")
+		with os.fdopen(fd, "wb") as out:
+			pickle.dump((fingerprint, self.entries), out,
+					protocol=pickle.HIGHEST_PROTOCOL)
+		os.chmod(tmp, 0o644)
+		os.replace(tmp, filename)
+
+	def load(self, filename, fingerprint):
+		"""Read cache from filename, unless it does not exist or was written
+		for a different model."""
+		if not os.path.exists(filename):
+			return
+		with open(filename, "rb") as inp:
+			cachedfingerprint, entries = pickle.load(inp)
+		if cachedfingerprint == fingerprint:
+			self.entries = entries
+			while len(self.entries) > self.maxsize:
+				self.entries.popitem(last=False)
+
+	def report(self):
+		"""Summarize cache use."""
+		return "%d entries, %d hits, %d misses, %d evictions" % (
+				len(self.entries), self.hits, self.misses, self.evictions)
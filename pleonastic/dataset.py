@@ -0,0 +1,162 @@
+import os
+import random
+import numpy as np
+import pandas as pd
+
+
+from collections import Counter, defaultdict
+
+
+def saveDataset(filename, rows):
+	"""Write feature rows to a numpy .npz file with typed columns.
+
+	Numeric columns are stored as arrays; other columns as integer codes
+	into a vocabulary of strings stored in the same file. Missing values,
+	and the string "None" that stands for them in the combined csv files,
+	get code -1; like pd.read_csv, loadDataset() returns them as NaN.
+
+	:param rows: DataFrame or list of feature dicts."""
+	df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+	arrays = {"columns": np.array(df.columns, dtype=str)}
+	for column in df.columns:
+		values = df[column]
+		if (pd.api.types.is_numeric_dtype(values)
+				and not pd.api.types.is_bool_dtype(values)
+				and not values.isna().any()):
+			arrays["num/" + column] = values.to_numpy()
+		else:
+			values = [None if pd.isna(value) or value == "None"
+					else str(value) for value in values]
+			vocab = sorted(set(values) - {None})
+			codes = {value: n for n, value in enumerate(vocab)}
+			arrays["cat/" + column] = np.array(
+					[codes.get(value, -1) for value in values], dtype=np.int32)
+			arrays["vocab/" + column] = np.array(vocab, dtype=str)
+	_write(filename, arrays)
+
+
+def _write(filename, arrays):
+	dirname = os.path.dirname(filename)
+	if dirname:
+		os.makedirs(dirname, exist_ok=True)
+	with open(filename, "wb") as out:
+		np.savez(out, **arrays)
+
+
+def loadDataset(filename):
+	"""Read a file written by saveDataset().
+
+	:returns: DataFrame with the columns in their original order;
+		categorical columns have a pandas category dtype."""
+	with np.load(filename, allow_pickle=False) as data:
+		columns = {}
+		for column in data["columns"].tolist():
+			if "num/" + column in data:
+				columns[column] = data["num/" + column]
+			else:
+				columns[column] = pd.Categorical.from_codes(
+						data["cat/" + column],
+						categories=data["vocab/" + column].astype(object))
+	return pd.DataFrame(columns)
+
+
+def combineDatasets(filenames, out, label, last=(), balance=False,
+		seed=None):
+	"""Write the rows of several datasets to a single dataset.
+
+	The input is read one dataset at a time, and only the label column
+	until the rows to write are known; memory use depends on the size of
+	the output, not on that of the corpus.
+
+	:param label: name of the column with the class of each row.
+	:param last: names of columns that are put last, in this order; the
+		other columns are sorted by name.
+	:param balance: if True, write a uniform random sample of each class,
+		the size of the smallest class, drawn with a reservoir sample per
+		class; otherwise, write all rows.
+	:param seed: seed for the random sample.
+	:returns: Counter with the number of rows written for each class."""
+	filenames = list(filenames)
+	columns = set()
+	counts = Counter()
+	for filename in filenames:
+		with np.load(filename, allow_pickle=False) as data:
+			columns.update(data["columns"].tolist())
+			if "num/" + label in data:
+				counts.update(data["num/" + label].tolist())
+	columns = sorted(columns - set(last)) + [a for a in last if a in columns]
+
+	# rows to write for each dataset; None means all rows
+	selected = defaultdict(lambda: None)
+	if balance and counts:
+		size = min(counts.values())
+		rng = random.Random(seed)
+		reservoirs = {cls: [] for cls in counts}
+		seen = Counter()
+		for n, filename in enumerate(filenames):
+			with np.load(filename, allow_pickle=False) as data:
+				if "num/" + label not in data:
+					continue
+				labels = data["num/" + label].tolist()
+			for row, cls in enumerate(labels):
+				seen[cls] += 1
+				if len(reservoirs[cls]) < size:
+					reservoirs[cls].append((n, row))
+				else:
+					k = rng.randrange(seen[cls])
+					if k < size:
+						reservoirs[cls][k] = (n, row)
+		selected = defaultdict(list)
+		for reservoir in reservoirs.values():
+			for n, row in reservoir:
+				selected[n].append(row)
+		for rows in selected.values():
+			rows.sort()
+
+	parts = defaultdict(list)
+	vocabs = defaultdict(dict)
+	written = Counter()
+	for n, filename in enumerate(filenames):
+		rows = selected[n]
+		if balance and not rows:
+			continue
+		with np.load(filename, allow_pickle=False) as data:
+			if "num/" + label not in data:
+				continue
+			if rows is None:
+				rows = np.arange(len(data["num/" + label]))
+			written.update(data["num/" + label][rows].tolist())
+			for column in columns:
+				if "num/" + column in data:
+					parts["num/" + column].append(data["num/" + column][rows])
+				elif "cat/" + column in data:
+					# recode into the vocabulary of the output; the last
+					# element maps code -1 (missing) to itself.
+					vocab = vocabs[column]
+					recode = np.array([vocab.setdefault(value, len(vocab))
+							for value in data["vocab/" + column].tolist()]
+							+ [-1], dtype=np.int32)
+					parts["cat/" + column].append(
+							recode[data["cat/" + column][rows]])
+				else:
+					raise ValueError("column %r missing in %s" % (
+							column, filename))
+
+	arrays = {"columns": np.array(columns, dtype=str)}
+	for column in columns:
+		if parts["num/" + column] and parts["cat/" + column]:
+			raise ValueError("column %r is both numeric and categorical"
+					% column)
+		if parts["num/" + column]:
+			arrays["num/" + column] = np.concatenate(parts["num/" + column])
+			continue
+		# sort the vocabulary, as saveDataset() does
+		vocab = sorted(vocabs[column])
+		order = {value: n for n, value in enumerate(vocab)}
+		recode = np.array([order[value] for value in vocabs[column]] + [-1],
+				dtype=np.int32)
+		arrays["cat/" + column] = recode[np.concatenate(
+				parts["cat/" + column] or [np.zeros(0, dtype=np.int32)])]
+		arrays["vocab/" + column] = np.array(vocab, dtype=str)
+	_write(out, arrays)
+	return written
@@ -6,38 +6,41 @@ def featureDict(node, tree):
 	d = OrderedDict()
 
 	# numerical features
-	adj = tree.getroot().findall('.//node[@pos="adj"]')
-	adv = tree.getroot().findall('.//node[@pos="adv"]')
-	comp = tree.getroot().findall('.//node[@pos="comp"]')
-	comparative = tree.getroot().findall('.//node[@pos="comparative"]')
-	det = tree.getroot().findall('.//node[@pos="det"]')
-	fixed = tree.getroot().findall('.//node[@pos="fixed"]')
-	name = tree.getroot().findall('.//node[@pos="name"]')
-	noun = tree.getroot().findall('.//node[@pos="noun"]')
-	num = tree.getroot().findall('.//node[@pos="num"]')
-	part = tree.getroot().findall('.//node[@pos="part"]')
-	pp = tree.getroot().findall('.//node[@pos"pp"]')
-	prefix = tree.getroot().findall('.//node[@pos="prefix"]')
-	prep = tree.getroot().findall('.//node[@pos="prep"]')
-	pron = tree.getroot().findall('.//node[@pos="pron"]')
-	punct = tree.getroot().findall('.//node[@pos="punct"]')
-	tag = tree.getroot().findall('.//node[@pos="tag"]')
-	verb = tree.getroot().findall('.//node[@pos"verb"]')
-	vg = tree.getroot().findall('.//node[@pos="vg"]')
+	index = treeIndex(tree)
+	adj = index.get("pos", "adj")
+	adv = index.get("pos", "adv")
+	comp = index.get("pos", "comp")
+	comparative = index.get("pos", "comparative")
+	det = index.get("pos", "det")
+	fixed = index.get("pos", "fixed")
+	name = index.get("pos", "name")
+	noun = index.get("pos", "noun")
+	num = index.get("pos", "num")
+	part = index.get("pos", "part")
+	# the original queries for pp and verb were malformed and never matched;
+	# the trained model expects these features to be zero.
+	pp = index.EMPTY
+	prefix = index.get("pos", "prefix")
+	prep = index.get("pos", "prep")
+	pron = index.get("pos", "pron")
+	punct = index.get("pos", "punct")
+	tag = index.get("pos", "tag")
+	verb = index.EMPTY
+	vg = index.get("pos", "vg")
 	
-	lid = tree.getroot().findall('.//node[@pt="lid"]')
-	spec = tree.getroot().findall('.//node[@pt="spec"]')
-	tsw = tree.getroot().findall('.//node[@pt="tsw"]')
+	lid = index.get("pt", "lid")
+	spec = index.get("pt", "spec")
+	tsw = index.get("pt", "tsw")
 	
-	het = tree.getroot().findall('.//node[@lemma="het"]')
-	iemand = tree.getroot().findall('.//node[@lemma="iemand"]')
-	niemand = tree.getroot().findall('.//node[@lemma="niemand"]')
+	het = index.get("lemma", "het")
+	iemand = index.get("lemma", "iemand")
+	niemand = index.get("lemma", "niemand")
 	
-	inf = tree.getroot().findall('.//node[@postag="WW(inf,nom,zonder,zonder-n)"]')
-	if inf == []:
-		inf = tree.getroot().findall('.//node[@postag="WW(inf,prenom,met-e)"]')
-		if inf == []:
-			inf = tree.getroot().findall('.//node[@postag="WW(inf,vrij,zonder)"]')
+	inf = index.get("postag", "WW(inf,nom,zonder,zonder-n)")
+	if len(inf) == 0:
+		inf = index.get("postag", "WW(inf,prenom,met-e)")
+		if len(inf) == 0:
+			inf = index.get("postag", "WW(inf,vrij,zonder)")
 
 	# previous next attributes
 	d["previous_pos"],\
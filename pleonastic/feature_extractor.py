@@ -1,19 +1,102 @@
+import functools
+
+
+from bisect import bisect_right
+from collections import defaultdict
 from lxml import etree
 
 
+class Positions:
+	"""Begin positions of the nodes matching one query, sorted by position.
+
+	For every split point, also stores the position of the node that comes
+	last in document order on either side of it, which is what iterating
+	over the matching nodes in document order yields in posAttrib()."""
+	__slots__ = ("begins", "prv", "nxt")
+
+	def __init__(self, begins):
+		""":param begins: begin positions of the nodes in document order."""
+		order = sorted(range(len(begins)), key=begins.__getitem__)
+		self.begins = [begins[n] for n in order]
+		self.prv = [None]
+		last = -1
+		for n in order:
+			if n > last:
+				last = n
+			self.prv.append(begins[last])
+		self.nxt = [None]
+		last = -1
+		for n in reversed(order):
+			if n > last:
+				last = n
+			self.nxt.append(begins[last])
+		self.nxt.reverse()
+
+	def __len__(self):
+		return len(self.begins)
+
+
+class TreeIndex:
+	"""Positions of each pos, pt, lemma and postag value in a tree.
+
+	Built in a single traversal; replaces a findall() over the whole tree
+	for every feature and every "het" node.
+
+	:ivar bybegin: maps a begin attribute to the first node in document
+		order with that begin.
+	:ivar byend: same for the end attribute."""
+	ATTRIBS = ("pos", "pt", "lemma", "postag")
+	EMPTY = Positions([])
+
+	def __init__(self, tree):
+		self.begins = defaultdict(list)
+		self.bybegin = {}
+		self.byend = {}
+		for node in tree.getroot().iterdescendants("node"):
+			for attrib in self.ATTRIBS:
+				value = node.get(attrib)
+				if value is not None:
+					self.begins[attrib, value].append(
+							float(node.attrib["begin"]))
+			self.bybegin.setdefault(node.get("begin"), node)
+			self.byend.setdefault(node.get("end"), node)
+		self.positions = {}
+
+	def get(self, attrib, value):
+		"""Return Positions of nodes in the tree with attrib == value."""
+		key = attrib, value
+		if key not in self.positions:
+			if key not in self.begins:
+				return self.EMPTY
+			self.positions[key] = Positions(self.begins[key])
+		return self.positions[key]
+
+
+@functools.lru_cache(maxsize=256)
+def treeIndex(tree):
+	"""Return the TreeIndex for tree, building it on first use.
+
+	lxml trees do not accept attributes or weak references, so the index is
+	cached here for the most recently used trees."""
+	return TreeIndex(tree)
+
+
 def posAttrib(pos, node):
+	"""Return distances from node to the last matching node after it and
+	the last matching node at or before it, in document order.
+
+	:param pos: Positions from a TreeIndex."""
 	nb = float(node.attrib["begin"])
 
 	nxt = 0.0
 	prv = 0.0
 
-	for i in pos:
-		ib = float(i.attrib["begin"])
-		if ib > nb:
-			nxt = ib-nb
-		else:
-			prv = nb-ib
-	
+	k = bisect_right(pos.begins, nb)
+	if pos.nxt[k] is not None:
+		nxt = pos.nxt[k] - nb
+	if pos.prv[k] is not None:
+		prv = nb - pos.prv[k]
+
 	return nxt, prv
 
 
@@ -22,30 +105,30 @@ def pnAttrib(node, tree, pn):
 
 	begin_id = node.get("begin")
 	end_id = node.get("end")
+	index = treeIndex(tree)
 
+	# the first node in document order that ends where node begins, or
+	# begins where node ends; this may be a phrasal node without pos/lemma.
 	if pn == "previous":
-		find0, find1, find2 = begin_id, "@end", "begin"
+		find0, find1, find2 = begin_id, index.byend, "begin"
 
 	if pn == "next":
-		find0, find1, find2 = end_id, "@begin", "end"
+		find0, find1, find2 = end_id, index.bybegin, "end"
 
-	try:
-		find = tree.getroot().findall('.//node['+ find1 + '="{}"]'.format(find0))[0]
+	find = find1.get(find0)
+	if find is not None:
 		find_pos = find.get("pos")
 		find_lemma = find.get("lemma")
-		
-		find_find = tree.getroot().findall('.//node['+ find1 + '="{}"]'.format(find.attrib[find2]))[0]
-		find_find = dict(find_find.attrib)
-
-		try:
-			# get features of word before previous word
-			find_find_pos = find_find["pos"]
-			find_find_lemma = find_find["lemma"]
-		except KeyError:
-			pass
-
-	except IndexError:
-		pass
+
+		find_find = find1.get(find.attrib[find2])
+		if find_find is not None:
+			find_find = find_find.attrib
+			try:
+				# get features of word before previous word
+				find_find_pos = find_find["pos"]
+				find_find_lemma = find_find["lemma"]
+			except KeyError:
+				pass
 
 	return find_pos, find_lemma, find_find_pos, find_find_lemma
 
@@ -0,0 +1,115 @@
+import re
+import time
+import numpy as np
+
+
+from scipy import sparse
+from sklearn import __version__ as sklearn_version
+
+
+# before 1.4, tree_.value holds weighted class counts that predict_proba
+# normalizes; later versions store the class fractions themselves.
+NORMALIZE = tuple(
+		int(a) for a in re.findall(r"\d+", sklearn_version)[:2]) < (1, 4)
+
+
+class ForestEngine:
+	"""Vectorized inference for a fitted RandomForestClassifier.
+
+	All trees are flattened once into contiguous arrays of split features,
+	thresholds, children and leaf class probabilities; a batch of rows is
+	evaluated for all trees at once with numpy. Predictions are the same as
+	those of the forest's own predict() and predict_proba().
+
+	:ivar latencies: list of (rows, seconds) for each evaluated batch."""
+	def __init__(self, forest, chunksize=1024):
+		"""Compile forest.
+
+		:param forest: fitted RandomForestClassifier with a single output.
+		:param chunksize: maximum number of rows traversed at once."""
+		if forest.n_outputs_ != 1:
+			raise ValueError("only single-output forests are supported")
+		trees = [estimator.tree_ for estimator in forest.estimators_]
+		self.classes_ = forest.classes_
+		self.n_classes_ = forest.n_classes_
+		self.n_trees = len(trees)
+		self.chunksize = chunksize
+		offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+		self.roots = offsets[:-1].astype(np.intp)
+		self.depth = max(tree.max_depth for tree in trees)
+
+		feature, threshold, left, right, proba = [], [], [], [], []
+		for tree, offset in zip(trees, offsets):
+			ids = np.arange(tree.node_count, dtype=np.intp) + offset
+			leaf = tree.children_left == -1
+			# leaves point to themselves so that every row can take the
+			# same number of steps regardless of the depth of its leaf.
+			feature.append(np.where(leaf, 0, tree.feature))
+			threshold.append(tree.threshold)
+			left.append(np.where(leaf, ids, tree.children_left + offset))
+			right.append(np.where(leaf, ids, tree.children_right + offset))
+			value = tree.value[:, 0, :self.n_classes_].astype(np.float64)
+			if NORMALIZE:
+				normalizer = value.sum(axis=1)[:, np.newaxis]
+				normalizer[normalizer == 0.0] = 1.0
+				value = value / normalizer
+			proba.append(value)
+		feature = np.concatenate(feature)
+		# only evaluate the columns that are used in a split
+		self.columns, feature = np.unique(feature, return_inverse=True)
+		self.feature = feature.astype(np.intp).ravel()
+		self.threshold = np.concatenate(threshold)
+		self.left = np.concatenate(left)
+		self.right = np.concatenate(right)
+		self.proba = np.concatenate(proba)
+		self.latencies = []
+
+	def predict_proba(self, X):
+		"""Return class probabilities for rows of X (dense or sparse)."""
+		start = time.perf_counter()
+		if sparse.issparse(X):
+			X = X.tocsc()[:, self.columns].toarray()
+		else:
+			X = np.asarray(X)[:, self.columns]
+		# like sklearn, compare float32 feature values to the thresholds
+		X = X.astype(np.float32)
+		result = np.zeros((X.shape[0], self.n_classes_), dtype=np.float64)
+		for a in range(0, X.shape[0], self.chunksize):
+			result[a:a + self.chunksize] = self._evaluate(
+					X[a:a + self.chunksize])
+		self.latencies.append((X.shape[0], time.perf_counter() - start))
+		return result
+
+	def predict(self, X):
+		"""Return predicted class labels for rows of X."""
+		return self.classes_.take(np.argmax(self.predict_proba(X), axis=1),
+				axis=0)
+
+	def _evaluate(self, X):
+		"""Traverse all trees for a chunk of rows; average leaf probabilities
+		in tree order as sklearn does."""
+		rows = np.arange(X.shape[0])[:, np.newaxis]
+		nodes = np.repeat(self.roots[np.newaxis, :], X.shape[0], axis=0)
+		for _ in range(self.depth):
+			values = X[rows, self.feature[nodes]]
+			nodes = np.where(values <= self.threshold[nodes],
+					self.left[nodes], self.right[nodes])
+		leafproba = self.proba[nodes]
+		proba = np.zeros((X.shape[0], self.n_classes_), dtype=np.float64)
+		for n in range(self.n_trees):
+			proba += leafproba[:, n]
+		proba /= self.n_trees
+		return proba
+
+	def report(self):
+		"""Summarize the latency of the batches evaluated so far."""
+		if not self.latencies:
+			return "no batches evaluated"
+		rows = sum(n for n, _ in self.latencies)
+		seconds = sum(t for _, t in self.latencies)
+		return ("%d batches, %d rows, %.2f ms/batch (max %.2f ms), "
+				"%.0f rows/s" % (
+				len(self.latencies), rows,
+				1000 * seconds / len(self.latencies),
+				1000 * max(t for _, t in self.latencies),
+				rows / seconds if seconds else 0))
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+
+from collections import Counter
+from joblib import dump, load
+from pleonastic.feature_dict import featureDict
+from pleonastic.feature_extractor import ruleExtractor
+from pleonastic.forest import ForestEngine
+from pleonastic.vectorizer import FeatureVectorizer
+
+
+def updatehash(h, filename):
+	"""Feed the contents of filename to the hash object h."""
+	with open(filename, "rb") as inp:
+		for chunk in iter(lambda: inp.read(1 << 20), b""):
+			h.update(chunk)
+
+
+def hashfile(filename):
+	"""Return the SHA-1 hash of the contents of filename."""
+	h = hashlib.sha1()
+	updatehash(h, filename)
+	return h.hexdigest()
+
+
+class PleonasticModel:
+	"""Classifier for pleonastic "het", loaded lazily from joblib files.
+
+	The forest and pipeline are only loaded when the first "het" candidate
+	is classified. With mmap_mode, the compiled forest is stored next to the
+	forest file and memory-mapped, so that concurrent processes share a
+	single copy of its arrays through the page cache. The compiled file
+	records a hash of the forest file it was made from, and is made again
+	when that file is replaced, whatever its modification time.
+
+	:ivar resolved: Counter with the number of nodes decided by each stage:
+		'rules', 'cache' and 'forest'."""
+	def __init__(self, clfpath, pipelinepath, mmap_mode=None,
+			cache=None, cascade=False, threshold=None):
+		"""
+		:param clfpath: joblib file with a RandomForestClassifier.
+		:param pipelinepath: joblib file with the fitted full_pipeline.
+		:param mmap_mode: if not None, joblib mmap_mode for the compiled
+			forest, e.g. 'r'.
+		:param cache: PredictionCache with verdicts for feature rows that
+			were seen before; pass None to disable.
+		:param cascade: if True, nodes matched by one of the rules of the
+			original DutchCoref module (see ruleExtractor()) are pleonastic
+			without extracting features or running the forest.
+		:param threshold: if not None, a node is pleonastic when the
+			forest's probability for class 1 is at least threshold;
+			otherwise, the most probable class is used."""
+		self.clfpath = clfpath
+		self.pipelinepath = pipelinepath
+		self.mmap_mode = mmap_mode
+		self.cache = cache
+		self.cascade = cascade
+		self.threshold = threshold
+		self.clf = self.pipeline = None
+		self.resolved = Counter()
+
+	def load(self):
+		"""Load the artifacts unless this has already been done."""
+		if self.clf is None:
+			self.clf = self._loadforest()
+			self.pipeline = FeatureVectorizer(load(self.pipelinepath))
+
+	def _loadforest(self):
+		if self.mmap_mode is None:
+			return ForestEngine(load(self.clfpath))
+		compiled = os.path.splitext(self.clfpath)[0] + ".forest.joblib"
+		source = hashfile(self.clfpath)
+		if os.path.exists(compiled):
+			stored = load(compiled, mmap_mode=self.mmap_mode)
+			if isinstance(stored, dict) and stored.get("source") == source:
+				return stored["engine"]
+		engine = ForestEngine(load(self.clfpath))
+		# write to a temporary file first, other processes may be
+		# loading the same model concurrently.
+		fd, tmp = tempfile.mkstemp(suffix=".tmp",
+				dir=os.path.dirname(compiled) or ".")
+		os.close(fd)
+		try:
+			dump(dict(source=source, engine=engine), tmp)
+			os.chmod(tmp, 0o644)
+			os.replace(tmp, compiled)
+		except OSError:
+			os.remove(tmp)
+			return engine
+		except BaseException:
+			os.remove(tmp)
+			raise
+		return load(compiled, mmap_mode=self.mmap_mode)["engine"]
+
+	def fingerprint(self):
+		"""Return a hash of the model files, to validate a stored cache."""
+		h = hashlib.sha1()
+		for filename in (self.clfpath, self.pipelinepath):
+			updatehash(h, filename)
+		return h.hexdigest()
+
+	def classify(self, nodes):
+		"""Classify a batch of "het" nodes with one transform and one predict.
+
+		In cascade mode, nodes matched by a rule skip everything else; rows
+		found in the cache skip the pipeline and the forest.
+
+		:param nodes: list of (node, tree) tuples.
+		:returns: dict mapping each node to True if it is pleonastic."""
+		if not nodes:
+			return {}
+		verdicts = {}
+		if self.cascade:
+			for node, _ in nodes:
+				if any(ruleExtractor(node)):
+					verdicts[node] = True
+			self.resolved['rules'] += len(verdicts)
+			nodes = [(node, tree) for node, tree in nodes
+					if node not in verdicts]
+		rows = [featureDict(node, tree) for node, tree in nodes]
+		results = [None] * len(rows)
+		if self.cache is not None:
+			keys = [self.cache.key(row) for row in rows]
+			results = [self.cache.get(key) for key in keys]
+		todo = [n for n, result in enumerate(results) if result is None]
+		self.resolved['cache'] += len(rows) - len(todo)
+		self.resolved['forest'] += len(todo)
+		if todo:
+			for n, result in zip(todo, self.predict([rows[n] for n in todo])):
+				results[n] = result
+				if self.cache is not None:
+					self.cache.put(keys[n], result)
+		for (node, _), (pleonastic, prob) in zip(nodes, results):
+			verdicts[node] = (pleonastic if self.threshold is None
+					else prob >= self.threshold)
+		return verdicts
+
+	def predict(self, rows):
+		"""Run the pipeline and forest on a list of feature dicts.
+
+		:returns: list of (verdict, probability) tuples; the verdict is True
+			if the forest predicts 1 (pleonastic), the probability is that
+			of class 1."""
+		self.load()
+		proba = self.clf.predict_proba(self.pipeline.transform(rows))
+		pred = self.clf.classes_.take(np.argmax(proba, axis=1), axis=0)
+		positive = list(self.clf.classes_).index(1)
+
+		# if classifier predicts 1: pronoun is pleonastic
+		return [(bool(p == 1), float(prob[positive]))
+				for p, prob in zip(pred, proba)]
+
+	def report(self):
+		"""Summarize the latency of the forest, the use of the cache and the
+		fraction of nodes decided by each stage."""
+		result = "not loaded" if self.clf is None else self.clf.report()
+		if self.cache is not None:
+			result += "; cache: %s" % self.cache.report()
+		total = sum(self.resolved.values())
+		if total:
+			result += "; resolved by %s" % ", ".join(
+					"%s: %d (%.1f%%)" % (stage, self.resolved[stage],
+						100 * self.resolved[stage] / total)
+					for stage in ('rules', 'cache', 'forest'))
+		return result
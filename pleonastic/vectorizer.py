@@ -0,0 +1,90 @@
+import numpy as np
+
+
+from scipy import sparse
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+class FeatureVectorizer:
+	"""Compiled version of a fitted full_pipeline for use at inference time.
+
+	Maps the feature dicts returned by featureDict() directly to the
+	matrix that full_pipeline.transform returns for the equivalent pandas
+	DataFrame, using the learned scaler means and scales, the one-hot
+	category vocabularies and the passthrough binary columns."""
+	def __init__(self, pipeline):
+		"""Compile a fitted FeatureUnion of selector pipelines.
+
+		:param pipeline: fitted FeatureUnion as stored in pipeline.joblib."""
+		if getattr(pipeline, "transformer_weights", None):
+			raise ValueError("transformer weights are not supported")
+		self.blocks = []
+		self.n_features = 0
+		for name, transformer in pipeline.transformer_list:
+			selector = transformer.steps[0][1]
+			attribs = list(selector.attribute_names)
+			steps = [step for _, step in transformer.steps[1:]]
+			if not steps:
+				block = ("bin", attribs, None)
+				width = len(attribs)
+			elif len(steps) == 1 and isinstance(steps[0], StandardScaler):
+				scaler = steps[0]
+				mean = (scaler.mean_ if scaler.with_mean
+						else np.zeros(len(attribs)))
+				scale = (scaler.scale_ if scaler.with_std
+						else np.ones(len(attribs)))
+				block = ("num", attribs, (mean, scale))
+				width = len(attribs)
+			elif len(steps) == 1 and isinstance(steps[0], OneHotEncoder):
+				encoder = steps[0]
+				if getattr(encoder, "drop", None) is not None:
+					raise ValueError("OneHotEncoder with drop is not supported")
+				vocab = []
+				offset = 0
+				for categories in encoder.categories_:
+					vocab.append({category: offset + n
+							for n, category in enumerate(categories.tolist())})
+					offset += len(categories)
+				block = ("cat", attribs,
+						(vocab, encoder.handle_unknown == "ignore"))
+				width = offset
+			else:
+				raise ValueError("cannot compile transformer %r" % name)
+			self.blocks.append(block + (self.n_features, ))
+			self.n_features += width
+
+	def transform(self, rows):
+		"""Vectorize a list of feature dicts.
+
+		:returns: scipy CSR matrix with one row per feature dict; identical
+			to the output of full_pipeline.transform."""
+		n = len(rows)
+		columns, values = [[] for _ in rows], [[] for _ in rows]
+		for kind, attribs, params, offset in self.blocks:
+			if kind == "cat":
+				vocab, ignore = params
+				for i, row in enumerate(rows):
+					for j, attrib in enumerate(attribs):
+						col = vocab[j].get(row[attrib])
+						if col is not None:
+							columns[i].append(offset + col)
+							values[i].append(1.0)
+						elif not ignore:
+							raise ValueError("unknown category %r in %s" % (
+									row[attrib], attrib))
+				continue
+			X = np.array([[row[attrib] for attrib in attribs] for row in rows],
+					dtype=np.float64).reshape(n, len(attribs))
+			if kind == "num":
+				mean, scale = params
+				X -= mean
+				X /= scale
+			for i, j in zip(*X.nonzero()):
+				columns[i].append(offset + j)
+				values[i].append(X[i, j])
+		indptr = np.zeros(n + 1, dtype=np.int32)
+		indptr[1:] = np.cumsum([len(a) for a in columns])
+		indices = np.array([col for a in columns for col in a], dtype=np.int32)
+		data = np.array([val for a in values for val in a], dtype=np.float64)
+		return sparse.csr_matrix((data, indices, indptr),
+				shape=(n, self.n_features))